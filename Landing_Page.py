@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime, date
-import base64
+from assets import image_data_uri
 
 # Set the page configuration
 st.set_page_config(page_title="Maturation Calculator", layout="wide", initial_sidebar_state="expanded")
@@ -15,14 +15,12 @@ GREY = "#9F9F9F"
 
 # Helper function to set background from a local file
 def set_background(png_file):
-    with open(png_file, "rb") as f:
-        data = f.read()
-    encoded = base64.b64encode(data).decode()
+    encoded = image_data_uri(png_file, max_width=1920)
     st.markdown(
         f"""
         <style>
             .stApp {{
-                background: linear-gradient(rgba(255, 255, 255, 0.5), rgba(255, 255, 255, 0.5)), url(data:image/png;base64,{encoded}) no-repeat center center fixed;
+                background: linear-gradient(rgba(255, 255, 255, 0.5), rgba(255, 255, 255, 0.5)), url({encoded}) no-repeat center center fixed;
                 background-size: cover;
             }}
         </style>
@@ -35,13 +33,11 @@ set_background("background_2.png")
 
 # Function to load and display logo in sidebar
 def add_sidebar_logo(logo_file):
-    with open(logo_file, "rb") as f:
-        data = f.read()
-    encoded = base64.b64encode(data).decode()
+    encoded = image_data_uri(logo_file, max_width=400, quality=90)
     st.sidebar.markdown(
         f"""
         <div style="text-align: center; padding-bottom: 20px;">
-            <img src="data:image/png;base64,{encoded}" width="200">
+            <img src="{encoded}" width="200">
         </div>
         """,
         unsafe_allow_html=True
@@ -0,0 +1,32 @@
+import base64
+import io
+import os
+
+import streamlit as st
+from PIL import Image
+
+
+@st.cache_resource(show_spinner=False)
+def _encode_image(path, mtime, max_width, quality):
+    image = Image.open(path)
+    if max_width and image.width > max_width:
+        image.thumbnail((max_width, image.height))
+    buffer = io.BytesIO()
+    try:
+        image.save(buffer, format="WEBP", quality=quality)
+        mime = "image/webp"
+    except (OSError, KeyError):
+        # Pillow built without WebP support
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+        mime = "image/png"
+    return f"data:{mime};base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+
+def image_data_uri(path, max_width=None, quality=80):
+    """
+    Data URI of an image, downscaled to max_width and re-encoded as WebP.
+    Encoded once per process (and again only if the file changes), so reruns
+    just reuse the string.
+    """
+    return _encode_image(path, os.path.getmtime(path), max_width, quality)
@@ -0,0 +1,34 @@
+"""
+Shared maturation model used by the Streamlit pages and batch tooling.
+
+`model` holds the single-athlete functions (one per workbook column),
+`engine` the whole-DataFrame equivalent, `validation` the upload checks,
+`streaming` the chunked CSV driver, `parallel` its multi-process
+variant, `export` the download files built on request, `history` the
+longitudinal assessment store, `growth` velocity and PHV timing across
+its assessments and `reference` the workbook's reference sheets, loaded
+once per process.
+"""
+
+from .engine import (
+    INPUT_COLUMNS,
+    RESULT_COLUMNS,
+    calculate_maturation_batch,
+    classify_maturity_status,
+    classify_timing,
+    parse_dates,
+    validate_and_fix_dates,
+)
+from .export import export_results, export_upload
+from .parallel import score_in_parallel
+from .reference import (
+    GENDER_CODES,
+    WORKBOOK_PATH,
+    ReferenceData,
+    build_cache,
+    encode_gender,
+    get_coefficient_table,
+    get_reference_data,
+)
+from .streaming import CHUNK_ROWS, iter_scored_chunks, score_csv_in_chunks
+from .validation import REPORT_COLUMNS, validate_upload
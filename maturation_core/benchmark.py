@@ -0,0 +1,141 @@
+"""
+Reproducible pipeline benchmark on synthetic athletes.
+
+    python -m maturation_core bench --rows 1000 100000 1000000 -o bench.json
+
+Each stage of the batch engine is timed on its own (CSV parse, date
+validation, upload validation, coefficient lookup, BA resolution, bounds,
+the whole engine and CSV export), alongside the row-by-row model path the
+pages used before the batch engine, on at most --rowwise-limit rows.
+Results are written as JSON so runs can be compared between releases.
+"""
+
+import io
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from . import model
+from .engine import calculate_ages, calculate_maturation_batch, validate_and_fix_dates
+from .reference import encode_gender, get_reference_data
+from .validation import validate_upload
+
+DEFAULT_ROWS = (1_000, 100_000, 1_000_000)
+
+# Row-by-row timings beyond this many rows would take minutes; rows/s is reported instead
+ROWWISE_LIMIT = 10_000
+
+
+def synthetic_athletes(n, seed=0):
+    """n athletes in the Group_template.csv schema, dd/mm/yyyy dates, ages 8 to 17."""
+    rng = np.random.default_rng(seed)
+    gender = rng.choice(['Male', 'Female'], n)
+    dob = pd.Timestamp('2008-01-01') + pd.to_timedelta(rng.integers(0, 365 * 10, n), unit='D')
+    test_date = dob + pd.to_timedelta(rng.integers(8 * 365, 17 * 365, n), unit='D')
+    age = (test_date - dob).days.to_numpy() / 365.25
+    height = 130 + (age - 8) * 5 + rng.normal(0, 6, n)
+    return pd.DataFrame({
+        'Name': [f'Athlete {i}' for i in range(n)],
+        'Gender': gender,
+        'Date of Birth': dob.strftime('%d/%m/%Y'),
+        'Test Date': test_date.strftime('%d/%m/%Y'),
+        'Body Mass (kg)': (height - 100 + rng.normal(0, 5, n)).round(1),
+        'Standing Height (cm)': height.round(1),
+        "Mother's Height (cm)": rng.normal(165, 6, n).round(1),
+        "Father's Height (cm)": rng.normal(178, 7, n).round(1),
+    })
+
+
+def score_rowwise(df):
+    """The per-row chain of model functions over iterrows, as the pages ran it."""
+    rows = []
+    for _, row in df.iterrows():
+        rows.append(model.calculate_athlete(
+            row['Gender'], row['Test Date'], row['Date of Birth'], row['Body Mass (kg)'],
+            row['Standing Height (cm)'], row["Mother's Height (cm)"], row["Father's Height (cm)"]
+        ))
+    return pd.DataFrame(rows, index=df.index)
+
+
+def _best_of(repeat, func, *args):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def benchmark(n, repeat=3, rowwise_limit=ROWWISE_LIMIT, seed=0, ref=None):
+    """Time every stage on n synthetic rows; returns a list of result dicts."""
+    if ref is None:
+        ref = get_reference_data()
+    csv_bytes = synthetic_athletes(n, seed).to_csv(index=False).encode('utf-8')
+    raw = pd.read_csv(io.BytesIO(csv_bytes), dtype={'Name': str})
+    fixed = validate_and_fix_dates(raw.copy())
+    gender_codes = encode_gender(fixed['Gender'])
+    _, round_age = calculate_ages(fixed['Date of Birth'], fixed['Test Date'])
+    results = calculate_maturation_batch(fixed, ref)
+    pct = results['Percent of Adult Height'].to_numpy()
+    predicted = results['Predicted Adult Height (cm)'].to_numpy()
+
+    stages = {
+        'read_csv': lambda: pd.read_csv(io.BytesIO(csv_bytes), dtype={'Name': str}),
+        'date_validation': lambda: validate_and_fix_dates(raw.copy()),
+        'upload_validation': lambda: validate_upload(raw.copy(), ref),
+        'coefficient_lookup': lambda: ref.coefficients.lookup(gender_codes, round_age),
+        'ba_resolution': lambda: ref.biological_age_index.lookup(gender_codes, pct),
+        'bounds': lambda: ref.error_bands.bounds(predicted, round_age),
+        'batch_engine': lambda: calculate_maturation_batch(fixed, ref),
+        'csv_export': lambda: results.to_csv(io.BytesIO(), index=False),
+    }
+    records = []
+    for stage, func in stages.items():
+        seconds = _best_of(repeat, func)
+        records.append({'rows': n, 'stage': stage, 'seconds': seconds, 'rows_per_s': n / seconds})
+
+    sample = fixed.iloc[:min(n, rowwise_limit)]
+    seconds = _best_of(1, score_rowwise, sample)
+    records.append({'rows': len(sample), 'stage': 'rowwise_model', 'seconds': seconds,
+                    'rows_per_s': len(sample) / seconds})
+    return records
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(rows=DEFAULT_ROWS, repeat=3, rowwise_limit=ROWWISE_LIMIT, seed=0, on_result=None):
+    """Benchmark every size in rows; returns the JSON-ready report."""
+    ref = get_reference_data()
+    records = []
+    for n in rows:
+        for record in benchmark(n, repeat, rowwise_limit, seed, ref):
+            records.append(record)
+            if on_result is not None:
+                on_result(record)
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'reference_version': ref.version,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.platform(),
+        'repeat': repeat,
+        'seed': seed,
+        'results': records,
+    }
+
+
+def write_report(report, path):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,206 @@
+"""
+Headless batch runner for the maturation model.
+
+    python -m maturation_core score athletes.csv history.parquet -o results/
+    python -m maturation_core build-cache
+    python -m maturation_core serve --port 8000
+    python -m maturation_core bench --rows 1000 100000 -o bench.json
+    python -m maturation_core golden check --engine batch
+
+Each input (Group_template.csv columns, CSV, Parquet or Arrow IPC) is
+scored in blocks with the batch engine and written to
+<output-dir>/<name>_results.csv (or .parquet / .arrow / .xlsx with
+--format), in the same columns as the Group calculator download. Inputs
+that would share an output name (a/x.csv and b/x.csv) are refused before
+anything is scored. --workers N scores the blocks in N processes with
+identical output. build-cache writes the
+binary copy of the workbook's reference sheets ahead of the first start.
+serve runs the local HTTP scoring API (see maturation_core.server) and
+bench times each pipeline stage on synthetic athletes, and golden checks
+an engine against the frozen expected outputs (see maturation_core.golden).
+"""
+
+import argparse
+import os
+import sys
+
+from .benchmark import DEFAULT_ROWS, ROWWISE_LIMIT, run_benchmarks, write_report
+from .golden import ENGINES, GOLDEN_PATH, check_engine, freeze
+from .parallel import score_in_parallel
+from .reference import WORKBOOK_PATH, build_cache, get_reference_data
+from .server import BATCH_WINDOW_MS, MAX_BATCH, make_server
+from .streaming import CHUNK_ROWS, OUTPUT_SUFFIXES, file_format_of, score_csv_in_chunks
+
+
+def output_path_for(input_path, output_dir, output_format="csv"):
+    """<output_dir>/<input name>_results.csv (.parquet / .arrow / .xlsx for those formats)"""
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir, f"{stem}_results{OUTPUT_SUFFIXES[output_format]}")
+
+
+def score_file(input_path, output_dir, chunk_rows=CHUNK_ROWS, workbook_path=WORKBOOK_PATH, workers=1,
+               write_report=False, output_format="csv"):
+    """Score one input file; returns (rows_scored, report DataFrame)."""
+    output_path = output_path_for(input_path, output_dir, output_format)
+    file_format = file_format_of(input_path)
+    with open(input_path, "rb") as source:
+        try:
+            with open(output_path, "wb") as output:
+                if workers > 1:
+                    rows_scored, report_df = score_in_parallel(
+                        source, output, workers, chunk_rows, workbook_path, file_format, output_format
+                    )
+                else:
+                    rows_scored, _, report_df = score_csv_in_chunks(
+                        source, output, chunk_rows, get_reference_data(workbook_path), preview_rows=0,
+                        file_format=file_format, output_format=output_format
+                    )
+        except Exception:
+            os.remove(output_path)
+            raise
+    if write_report and not report_df.empty:
+        stem = os.path.splitext(os.path.basename(input_path))[0]
+        report_df.to_csv(os.path.join(output_dir, f"{stem}_validation.csv"), index=False)
+    return rows_scored, report_df
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m maturation_core", description="Maturation calculator batch tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser("score", help="Score Group_template CSV/Parquet/Arrow files.")
+    score.add_argument("inputs", nargs="+", help="Input .csv, .parquet or .arrow/.feather files.")
+    score.add_argument("-o", "--output-dir", default=".", help="Directory for <name>_results.csv (default: current).")
+    score.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help=f"Rows per block (default: {CHUNK_ROWS}).")
+    score.add_argument("--workbook", default=WORKBOOK_PATH, help="Reference workbook (default: Maturation_calculator.xlsx).")
+    score.add_argument("-j", "--workers", type=int, default=1, help="Scoring processes (default: 1).")
+    score.add_argument("--report", action="store_true", help="Also write <name>_validation.csv for rows with problems.")
+    score.add_argument("--format", choices=sorted(OUTPUT_SUFFIXES), default="csv", dest="output_format",
+                       help="Results file format (default: csv).")
+
+    cache = commands.add_parser("build-cache", help="Write the binary cache of the reference workbook.")
+    cache.add_argument("--workbook", default=WORKBOOK_PATH, help="Reference workbook (default: Maturation_calculator.xlsx).")
+
+    serve = commands.add_parser("serve", help="Run the local HTTP scoring API.")
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1).")
+    serve.add_argument("--port", type=int, default=8000, help="Port (default: 8000).")
+    serve.add_argument("--workbook", default=WORKBOOK_PATH, help="Reference workbook (default: Maturation_calculator.xlsx).")
+    serve.add_argument("--batch-window-ms", type=float, default=BATCH_WINDOW_MS,
+                       help=f"Wait for concurrent /score requests to batch together (default: {BATCH_WINDOW_MS}).")
+    serve.add_argument("--max-batch", type=int, default=MAX_BATCH, help=f"Largest micro-batch (default: {MAX_BATCH}).")
+    serve.add_argument("-v", "--verbose", action="store_true", help="Log every request.")
+
+    bench = commands.add_parser("bench", help="Time each pipeline stage on synthetic athletes.")
+    bench.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS),
+                       help="Dataset sizes (default: 1000 100000 1000000).")
+    bench.add_argument("--repeat", type=int, default=3, help="Runs per stage, best kept (default: 3).")
+    bench.add_argument("--rowwise-limit", type=int, default=ROWWISE_LIMIT,
+                       help=f"Rows timed on the row-by-row path (default: {ROWWISE_LIMIT}).")
+    bench.add_argument("--seed", type=int, default=0, help="Synthetic data seed (default: 0).")
+    bench.add_argument("-o", "--output", default="benchmark_results.json", help="JSON results file.")
+
+    golden = commands.add_parser("golden", help="Check an engine against, or re-freeze, the golden outputs.")
+    golden.add_argument("action", choices=["check", "freeze"])
+    golden.add_argument("--engine", choices=sorted(ENGINES), default="batch", help="Engine to check (default: batch).")
+    golden.add_argument("--path", default=GOLDEN_PATH, help="Golden file (default: golden_outputs.csv.gz).")
+    return parser
+
+
+def colliding_outputs(inputs, output_dir, output_format="csv"):
+    """{output path: inputs} for outputs that more than one input would write, e.g. a/x.csv and b/x.csv."""
+    outputs = {}
+    for input_path in inputs:
+        output_path = os.path.abspath(output_path_for(input_path, output_dir, output_format))
+        outputs.setdefault(output_path, []).append(input_path)
+    return {output_path: paths for output_path, paths in outputs.items() if len(paths) > 1}
+
+
+def run_score(args):
+    collisions = colliding_outputs(args.inputs, args.output_dir, args.output_format)
+    if collisions:
+        for output_path, paths in collisions.items():
+            print(f"{', '.join(paths)}: would all be written to {output_path}; "
+                  "rename the inputs or score them into separate output directories", file=sys.stderr)
+        return 2
+    os.makedirs(args.output_dir, exist_ok=True)
+    failed = 0
+    for input_path in args.inputs:
+        try:
+            rows_scored, report_df = score_file(
+                input_path, args.output_dir, args.chunk_rows, args.workbook, args.workers, args.report,
+                args.output_format
+            )
+        except (OSError, ValueError, ImportError) as e:
+            print(f"{input_path}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        problems = report_df['Row'].nunique()
+        print(f"{input_path}: {rows_scored:,} rows scored, {problems:,} with problems -> "
+              f"{output_path_for(input_path, args.output_dir, args.output_format)}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def run_build_cache(args):
+    try:
+        cache_path = build_cache(args.workbook)
+    except (OSError, ValueError) as e:
+        print(f"{args.workbook}: {e}", file=sys.stderr)
+        return 1
+    if not os.path.exists(cache_path):
+        print(f"{cache_path}: could not be written", file=sys.stderr)
+        return 1
+    print(f"{args.workbook} -> {cache_path}", file=sys.stderr)
+    return 0
+
+
+def run_serve(args):
+    server = make_server(args.host, args.port, args.workbook, args.batch_window_ms, args.max_batch, args.verbose)
+    print(f"Scoring API on http://{args.host}:{server.server_port} (reference {server.ref.version[:12]})",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def run_bench(args):
+    def show(record):
+        print(f"{record['rows']:>9,} rows  {record['stage']:<20} {record['seconds']:9.4f} s "
+              f"{record['rows_per_s']:>14,.0f} rows/s", file=sys.stderr)
+
+    report = run_benchmarks(args.rows, args.repeat, args.rowwise_limit, args.seed, on_result=show)
+    write_report(report, args.output)
+    print(f"Results written to {args.output}", file=sys.stderr)
+    return 0
+
+
+def run_golden(args):
+    if args.action == "freeze":
+        frozen = freeze(args.path)
+        print(f"{len(frozen):,} golden rows written to {args.path}", file=sys.stderr)
+        return 0
+    mismatches = check_engine(ENGINES[args.engine], args.path)
+    if mismatches.empty:
+        print(f"{args.engine}: matches {args.path}", file=sys.stderr)
+        return 0
+    print(f"{args.engine}: {mismatches['Row'].nunique():,} rows differ from {args.path}", file=sys.stderr)
+    print(mismatches.head(20).to_string(index=False), file=sys.stderr)
+    return 1
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "score":
+        return run_score(args)
+    if args.command == "build-cache":
+        return run_build_cache(args)
+    if args.command == "serve":
+        return run_serve(args)
+    if args.command == "bench":
+        return run_bench(args)
+    if args.command == "golden":
+        return run_golden(args)
+    return 2
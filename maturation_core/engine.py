@@ -0,0 +1,137 @@
+"""Whole-DataFrame maturation engine for group uploads and batch tooling."""
+
+import numpy as np
+import pandas as pd
+
+from .reference import encode_gender, get_reference_data
+from .timing import timed
+
+# Columns of Group_template.csv
+INPUT_COLUMNS = [
+    'Name', 'Gender', 'Date of Birth', 'Test Date', 'Body Mass (kg)',
+    'Standing Height (cm)', "Mother's Height (cm)", "Father's Height (cm)",
+]
+
+# Accepted upload date formats, in order of preference
+DATE_FORMATS = ('%d/%m/%Y', 'ISO8601')
+
+# Columns of the group results download
+RESULT_COLUMNS = INPUT_COLUMNS + [
+    'Chronological Age', 'Biological Age', 'BA-CA', 'Predicted Adult Height (cm)',
+    'Percent of Adult Height', 'Maturity Status', 'Timing', 'Alt. Timing',
+    '50% Lower Bound', '50% Upper Bound', '90% Lower Bound', '90% Upper Bound',
+]
+
+
+def parse_dates(values):
+    """
+    Parse a date column once, column-wise: dd/mm/yyyy as the upload
+    instructions ask, falling back to ISO yyyy-mm-dd (the template's format).
+    Columns that are already datetime64 are returned unchanged.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    parsed = pd.to_datetime(values, format=DATE_FORMATS[0], errors='coerce')
+    for date_format in DATE_FORMATS[1:]:
+        unparsed = parsed.isna() & values.notna()
+        if not unparsed.any():
+            break
+        parsed[unparsed] = pd.to_datetime(values[unparsed], format=date_format, errors='coerce')
+    return parsed
+
+@timed('validate_and_fix_dates')
+def validate_and_fix_dates(df):
+    """Parse both date columns, swapping them where Test Date precedes Date of Birth."""
+    dob = parse_dates(df['Date of Birth'])
+    test_date = parse_dates(df['Test Date'])
+    swapped = test_date < dob
+    df['Date of Birth'] = dob.mask(swapped, test_date)
+    df['Test Date'] = test_date.mask(swapped, dob)
+    return df
+
+def calculate_ages(dob, test_date):
+    """
+    Chronological age in years and the same age rounded to the nearest half
+    year (the coefficient and error tables' key), as float arrays.
+    """
+    chrono_age = ((test_date - dob).dt.days / 365.25).to_numpy(dtype=float)
+    return chrono_age, np.round(chrono_age / 0.5) * 0.5
+
+def classify_timing(ba_ca_vals, threshold):
+    """Vectorised calculate_timing / calculate_alt_timing."""
+    return np.select(
+        [np.isnan(ba_ca_vals), ba_ca_vals > threshold, ba_ca_vals <= -threshold],
+        ["", "Early", "Late"],
+        default="On Time"
+    )
+
+def classify_maturity_status(percent_predicted):
+    """Vectorised calculate_maturity_status."""
+    return np.select(
+        [np.isnan(percent_predicted), percent_predicted <= 88, percent_predicted <= 95],
+        ["", "Pre-PHV", "Circa-PHV"],
+        default="Post PHV"
+    )
+
+@timed('calculate_maturation_batch')
+def calculate_maturation_batch(df, ref=None, quantiles=(0.5, 0.9), dates_as_text=True):
+    """
+    Whole-DataFrame equivalent of the per-row calculation chain, using the
+    compiled tables of a ReferenceData (the shared store when None). One pair
+    of bound columns is produced per Errors quantile in `quantiles`.
+    Expects datetime64 date columns from validate_and_fix_dates; rows with
+    invalid dates or numbers come back as NaN / "" instead of raising.
+    Dates come back as 'YYYY-MM-DD' text, or as datetime64 when
+    dates_as_text is False (for typed Parquet / Arrow output).
+    """
+    if ref is None:
+        ref = get_reference_data()
+    gender = df['Gender']
+    dob = parse_dates(df['Date of Birth'])
+    test_date = parse_dates(df['Test Date'])
+    body_mass_kg = pd.to_numeric(df['Body Mass (kg)'], errors='coerce').to_numpy(dtype=float)
+    standing_height_cm = pd.to_numeric(df['Standing Height (cm)'], errors='coerce').to_numpy(dtype=float)
+    mothers_height_cm = pd.to_numeric(df["Mother's Height (cm)"], errors='coerce').to_numpy(dtype=float)
+    fathers_height_cm = pd.to_numeric(df["Father's Height (cm)"], errors='coerce').to_numpy(dtype=float)
+
+    chrono_age, round_age = calculate_ages(dob, test_date)
+
+    # One gather from the compiled coefficient table; ages not in the sheet give NaN
+    gender_codes = encode_gender(gender)
+    intersect_val, height_coef, weight_coef, midparent_coef = ref.coefficients.lookup(gender_codes, round_age).T
+
+    adj_mother_cm = (2.803 + 0.953 * (mothers_height_cm * 0.393701)) * 2.54
+    adj_father_cm = (2.316 + 0.955 * (fathers_height_cm * 0.393701)) * 2.54
+    midparent_height = (adj_mother_cm + adj_father_cm) / 2
+
+    predicted_height = (intersect_val + (height_coef * standing_height_cm) + (weight_coef * body_mass_kg)
+                        + (midparent_coef * midparent_height))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct_predicted = np.where(predicted_height == 0, np.nan, standing_height_cm / predicted_height * 100)
+
+    bio_age = ref.biological_age_index.lookup(gender_codes, pct_predicted)
+    ba_ca_val = bio_age - chrono_age
+    bounds = ref.error_bands.bounds(predicted_height, round_age, quantiles)
+
+    results = pd.DataFrame({
+        'Name': df['Name'],
+        'Gender': gender,
+        'Date of Birth': dob.dt.strftime('%Y-%m-%d') if dates_as_text else dob,
+        'Test Date': test_date.dt.strftime('%Y-%m-%d') if dates_as_text else test_date,
+        'Body Mass (kg)': body_mass_kg,
+        'Standing Height (cm)': standing_height_cm,
+        "Mother's Height (cm)": mothers_height_cm,
+        "Father's Height (cm)": fathers_height_cm,
+        'Chronological Age': chrono_age,
+        'Biological Age': bio_age,
+        'BA-CA': ba_ca_val,
+        'Predicted Adult Height (cm)': predicted_height,
+        'Percent of Adult Height': pct_predicted,
+        'Maturity Status': classify_maturity_status(pct_predicted),
+        'Timing': classify_timing(ba_ca_val, 0.5),
+        'Alt. Timing': classify_timing(ba_ca_val, 1)
+    }, index=df.index)
+    for q, (lower, upper) in bounds.items():
+        results[f'{q:.0%} Lower Bound'] = lower
+        results[f'{q:.0%} Upper Bound'] = upper
+    return results
@@ -0,0 +1,52 @@
+"""
+Results files for download, built block by block in a spooled temporary
+file (in memory up to SPOOL_BYTES, then on disk) so no whole-file string
+is formatted in one go, and returned as bytes. Pages pass these functions
+to a download button as callables, so the file is only produced when it
+is requested.
+"""
+
+import gzip
+from tempfile import SpooledTemporaryFile
+
+from .streaming import CHUNK_ROWS, ResultWriter, encode_block, score_csv_in_chunks
+
+# Bytes held in memory before the export spills to a temporary file
+SPOOL_BYTES = 64 * 1024 * 1024
+
+
+def _spooled(write, compress):
+    with SpooledTemporaryFile(max_size=SPOOL_BYTES) as spool:
+        if compress:
+            with gzip.GzipFile(fileobj=spool, mode='wb', mtime=0) as output:
+                write(output)
+        else:
+            write(spool)
+        spool.seek(0)
+        return spool.read()
+
+
+def export_results(results, output_format='csv', compress=False, chunk_rows=CHUNK_ROWS):
+    """
+    Write a results frame as CSV, Parquet, Arrow IPC or an xlsx workbook
+    with a sheet per Maturity Status, chunk_rows rows at a time,
+    gzip-compressed when compress is set. Returns the file's bytes.
+    """
+    def write(output):
+        writer = ResultWriter(output, output_format)
+        for start in range(0, max(len(results), 1), chunk_rows):
+            writer.write(encode_block(results.iloc[start:start + chunk_rows], output_format, header=start == 0))
+        writer.close()
+    return _spooled(write, compress)
+
+
+def export_upload(source, file_format='csv', output_format='csv', compress=False, ref=None):
+    """
+    Score a Group_template source again straight into a spooled results file,
+    for uploads with more results than were kept in memory. Returns the
+    file's bytes.
+    """
+    def write(output):
+        score_csv_in_chunks(source, output, ref=ref, preview_rows=0, file_format=file_format,
+                            output_format=output_format)
+    return _spooled(write, compress)
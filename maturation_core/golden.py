@@ -0,0 +1,240 @@
+"""
+Golden-output corpus: generated inputs covering every half-year age of the
+coefficient table (and either side of it), both genders, swapped dates,
+rounding boundaries, %PAH at and around the maturity thresholds and beyond
+the SA curve, and missing or invalid values. Expected outputs come from
+score_workbook, a separate row-by-row implementation of the workbook
+formulas on the raw sheets read straight from the xlsx (INDEX/MATCH and
+XLOOKUP as pandas lookups). It shares nothing with the compiled
+reference tables but the date fixing, so a regression in table
+compilation or in a lookup cannot hide in the expectations. They are
+frozen in golden_outputs.csv.gz; check_engine compares any engine with
+them.
+
+    python -m maturation_core golden check --engine batch
+    python -m maturation_core golden freeze
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from .engine import INPUT_COLUMNS, RESULT_COLUMNS, calculate_maturation_batch, validate_and_fix_dates
+from .reference import GENDER_CODES, REFERENCE_SHEETS, WORKBOOK_PATH, get_reference_data
+from .validation import validate_upload
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'golden_outputs.csv.gz')
+
+# %PAH targets: far below, around 88 and 95, above and beyond the SA curve
+PAH_TARGETS = (40.0, 75.0, 87.9, 88.0, 88.1, 91.5, 94.9, 95.0, 95.1, 99.0, 100.0, 101.0, 115.0)
+
+# Days either side of a rounding boundary, and mid-interval
+AGE_OFFSETS = (-0.25, 0.0, 0.25)
+
+DATE_FORMAT = '%d/%m/%Y'
+RTOL = 1e-9
+ATOL = 1e-6
+
+# 'Metric coefficients' columns per gender: age, intersect, height, weight and midparent coefficients
+SHEET_COEFFICIENTS = {
+    'Male': ('Age', 'Beta', 'Stature (in)', 'Weight (lb)', 'Midparent Stature (in)'),
+    'Female': ('Age.1', 'Intersect', 'Height', 'Weight', 'Md parent'),
+}
+SHEET_PAH = {'Male': '%PAH Males', 'Female': '%PAH females'}
+
+
+def build_corpus():
+    """Inputs in the Group_template.csv schema, dates as dd/mm/yyyy strings."""
+    ref = get_reference_data()
+    weight_kg, mother_cm, father_cm = 55.0, 165.0, 180.0
+    midparent = ((2.803 + 0.953 * (mother_cm * 0.393701)) * 2.54 + (2.316 + 0.955 * (father_cm * 0.393701)) * 2.54) / 2
+    rows = []
+    dob = pd.Timestamp('2000-03-01')
+    for half_year in np.arange(3.0, 20.5, 0.5):
+        for offset in AGE_OFFSETS:
+            # Just inside the half-year's rounding interval at each end, and its centre
+            days = int(round((half_year + offset) * 365.25)) - int(np.sign(offset))
+            test_date = dob + pd.Timedelta(days=days)
+            for gender in GENDER_CODES:
+                intersect, height_coef, weight_coef, midparent_coef = ref.coefficients.lookup(
+                    np.array([GENDER_CODES[gender]]), np.array([half_year]))[0]
+                for target in PAH_TARGETS:
+                    share = target / 100
+                    height = share * (intersect + weight_coef * weight_kg + midparent_coef * midparent) / (1 - share * height_coef)
+                    if np.isnan(height):
+                        height = 100 + 5 * half_year
+                    swapped = len(rows) % 4 == 3
+                    rows.append({
+                        'Name': f'G{len(rows)}',
+                        'Gender': gender,
+                        'Date of Birth': (test_date if swapped else dob).strftime(DATE_FORMAT),
+                        'Test Date': (dob if swapped else test_date).strftime(DATE_FORMAT),
+                        'Body Mass (kg)': weight_kg,
+                        'Standing Height (cm)': round(float(height), 6),
+                        "Mother's Height (cm)": mother_cm,
+                        "Father's Height (cm)": father_cm,
+                    })
+    corpus = pd.DataFrame(rows, columns=INPUT_COLUMNS)
+
+    # Missing and invalid values
+    special = corpus.iloc[:6].copy()
+    special['Name'] = [f'S{i}' for i in range(len(special))]
+    special.loc[special.index[0], 'Gender'] = 'Other'
+    special.loc[special.index[1], 'Date of Birth'] = None
+    special.loc[special.index[2], 'Test Date'] = '31/02/2020'
+    special.loc[special.index[3], 'Body Mass (kg)'] = np.nan
+    special.loc[special.index[4], "Father's Height (cm)"] = np.nan
+    special.loc[special.index[5], 'Test Date'] = '2012-06-30'
+    return pd.concat([corpus, special], ignore_index=True)
+
+
+def score_batch(df):
+    """Batch engine, as the Group calculator runs it."""
+    df, _ = validate_upload(df.copy())
+    return calculate_maturation_batch(df)
+
+
+def _with_inputs(df, results):
+    """Template inputs (dates as yyyy-mm-dd, numbers as floats) beside row-by-row results, in RESULT_COLUMNS."""
+    inputs = pd.DataFrame({
+        'Name': df['Name'],
+        'Gender': df['Gender'],
+        'Date of Birth': df['Date of Birth'].dt.strftime('%Y-%m-%d'),
+        'Test Date': df['Test Date'].dt.strftime('%Y-%m-%d'),
+    }, index=df.index)
+    for col in INPUT_COLUMNS[4:]:
+        inputs[col] = pd.to_numeric(df[col], errors='coerce')
+    return pd.concat([inputs, results], axis=1)[RESULT_COLUMNS]
+
+
+def score_rowwise(df):
+    """Row-by-row model functions after the same date fixing."""
+    from .benchmark import score_rowwise as rowwise
+    df = validate_and_fix_dates(df.copy())
+    return _with_inputs(df, rowwise(df))
+
+
+def _index_match(sheet, age_col, age, value_col):
+    """INDEX(value_col, MATCH(age, age_col, 0)): the first row with that age, NaN when there is none."""
+    match = sheet[age_col].eq(age)
+    return sheet.loc[match.idxmax(), value_col] if match.any() else np.nan
+
+
+def _timing(ba_ca, threshold):
+    if np.isnan(ba_ca):
+        return ""
+    if ba_ca > threshold:
+        return "Early"
+    if ba_ca <= -threshold:
+        return "Late"
+    return "On Time"
+
+
+def _workbook_row(row, coefficients, sa, errors):
+    """One Input sheet row, formula by formula."""
+    gender = row['Gender']
+    mass, height, mother, father = (float(pd.to_numeric(row[col], errors='coerce')) for col in INPUT_COLUMNS[4:])
+    if pd.isna(row['Date of Birth']) or pd.isna(row['Test Date']):
+        chrono_age = np.nan
+    else:
+        chrono_age = (row['Test Date'] - row['Date of Birth']).days / 365.25
+    # MROUND(age, 0.5)
+    round_age = np.floor(chrono_age / 0.5 + 0.5) * 0.5
+
+    if gender in SHEET_COEFFICIENTS:
+        age_col, *value_cols = SHEET_COEFFICIENTS[gender]
+        intersect, height_coef, weight_coef, midparent_coef = (
+            _index_match(coefficients, age_col, round_age, col) for col in value_cols)
+    else:
+        intersect = height_coef = weight_coef = midparent_coef = np.nan
+    midparent = ((2.803 + 0.953 * (mother * 0.393701)) * 2.54 + (2.316 + 0.955 * (father * 0.393701)) * 2.54) / 2
+    predicted = intersect + height_coef * height + weight_coef * mass + midparent_coef * midparent
+    pct = np.nan if np.isnan(predicted) or predicted == 0 else height / predicted * 100
+
+    # XLOOKUP(0, ABS(%PAH - Z2), Age, , 1): the nearest %PAH, first row on ties
+    if gender in SHEET_PAH and not np.isnan(pct):
+        bio_age = sa.loc[(sa[SHEET_PAH[gender]] - pct).abs().idxmin(), 'Age']
+    else:
+        bio_age = np.nan
+    ba_ca = bio_age - chrono_age
+
+    result = {
+        'Chronological Age': chrono_age,
+        'Biological Age': bio_age,
+        'BA-CA': ba_ca,
+        'Predicted Adult Height (cm)': predicted,
+        'Percent of Adult Height': pct,
+        'Maturity Status': "" if np.isnan(pct) else "Pre-PHV" if pct <= 88 else "Circa-PHV" if pct <= 95 else "Post PHV",
+        'Timing': _timing(ba_ca, 0.5),
+        'Alt. Timing': _timing(ba_ca, 1),
+    }
+    # Y2 -/+ the Errors row at rounded age + 0.5, as the calculator has always
+    # looked it up: the first age at or above it, 0 past the end of the sheet
+    later = errors['Age'].ge(round_age + 0.5)
+    for q in (0.5, 0.9):
+        error = errors.loc[later.idxmax(), q] if later.any() else 0.0
+        result[f'{q:.0%} Lower Bound'] = predicted - error
+        result[f'{q:.0%} Upper Bound'] = predicted + error
+    return result
+
+
+def score_workbook(df, workbook_path=WORKBOOK_PATH):
+    """
+    The workbook's Input sheet formulas row by row on the raw reference
+    sheets, read from the xlsx itself rather than the .npz cache.
+    """
+    sheets = pd.read_excel(workbook_path, sheet_name=list(REFERENCE_SHEETS))
+    df = validate_and_fix_dates(df.copy())
+    rows = [_workbook_row(row, sheets['Metric coefficients'], sheets['SA'], sheets['Errors'])
+            for _, row in df.iterrows()]
+    return _with_inputs(df, pd.DataFrame(rows, index=df.index))
+
+
+ENGINES = {'batch': score_batch, 'rowwise': score_rowwise}
+
+
+def freeze(path=GOLDEN_PATH, score_fn=score_workbook):
+    """Score the corpus and write inputs plus expected outputs; returns the frame written."""
+    corpus = build_corpus()
+    expected = score_fn(corpus)
+    frozen = pd.concat([corpus.add_prefix('input: '), expected.reset_index(drop=True)], axis=1)
+    frozen.to_csv(path, index=False, float_format='%.12g', compression={'method': 'gzip', 'mtime': 0})
+    return frozen
+
+
+def load_golden(path=GOLDEN_PATH):
+    """(inputs, expected) from the frozen file."""
+    frozen = pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[''])
+    inputs = frozen[[f'input: {col}' for col in INPUT_COLUMNS]]
+    inputs.columns = INPUT_COLUMNS
+    for col in INPUT_COLUMNS[4:]:
+        inputs[col] = pd.to_numeric(inputs[col])
+    expected = frozen[RESULT_COLUMNS]
+    return inputs, expected
+
+
+def check_engine(score_fn, path=GOLDEN_PATH, rtol=RTOL, atol=ATOL):
+    """
+    Score the frozen inputs with score_fn (template frame -> RESULT_COLUMNS
+    frame) and compare with the expected outputs: numbers within rtol/atol,
+    NaN only where NaN is expected, text exactly.
+    Returns a DataFrame of mismatches (Row, Column, Expected, Actual).
+    """
+    inputs, expected = load_golden(path)
+    actual = score_fn(inputs).reset_index(drop=True)
+    mismatches = []
+    for col in RESULT_COLUMNS:
+        want = expected[col]
+        got = actual[col]
+        want_num = pd.to_numeric(want, errors='coerce')
+        if want_num.notna().sum() == want.notna().sum() and want.notna().any():
+            got_num = pd.to_numeric(got, errors='coerce').to_numpy(dtype=float)
+            want_num = want_num.to_numpy(dtype=float)
+            close = np.isclose(got_num, want_num, rtol=rtol, atol=atol, equal_nan=True)
+        else:
+            close = (want.fillna('').astype(str).to_numpy() == got.fillna('').astype(str).to_numpy())
+        bad = np.flatnonzero(~close)
+        mismatches.append(pd.DataFrame({'Row': bad, 'Column': col, 'Expected': want.to_numpy()[bad],
+                                        'Actual': got.to_numpy()[bad]}))
+    return pd.concat(mismatches, ignore_index=True)
@@ -0,0 +1,70 @@
+"""
+Growth across repeated assessments: height velocity between consecutive
+tests of an athlete and timing relative to peak height velocity (PHV) on
+the SA height curves. Athletes are grouped by sorting, with no per-athlete loop.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .reference import GENDER_CODES, encode_gender, get_reference_data
+from .timing import timed
+
+ATHLETE_COLUMNS = ['Name', 'Date of Birth']
+
+GROWTH_COLUMNS = ['Height Velocity (cm/yr)', 'Years from PHV', 'Age at PHV']
+
+
+@timed('calculate_growth')
+def calculate_growth(results, ref=None):
+    """
+    Add GROWTH_COLUMNS to scored results (RESULT_COLUMNS) holding any number
+    of assessments per athlete (Name + Date of Birth):
+
+    - Height Velocity (cm/yr): height gained since the athlete's previous
+      Test Date divided by the years between them; NaN for a first test
+      and for untracked rows (no Name or Date of Birth).
+    - Years from PHV: Biological Age minus the SA curve's age at peak
+      height velocity for the sex (BiologicalAgeIndex.peak_velocity_age);
+      negative before PHV.
+    - Age at PHV: projected chronological age at PHV, Chronological Age
+      minus Years from PHV.
+
+    Returns a copy of results in its original row order.
+    """
+    if ref is None:
+        ref = get_reference_data()
+    test_date = pd.to_datetime(results['Test Date'], errors='coerce')
+    height = pd.to_numeric(results['Standing Height (cm)'], errors='coerce').to_numpy(dtype=float)
+
+    # Sort by athlete then Test Date; consecutive rows of one athlete are neighbours.
+    # Athletes are compared by factorized codes, so missing names (code -1) never break the sort
+    codes = [pd.factorize(results[col])[0] for col in ATHLETE_COLUMNS]
+    order = np.lexsort((test_date.to_numpy(), *reversed(codes)))
+    athlete = np.column_stack(codes)[order]
+    same_athlete = np.zeros(len(order), dtype=bool)
+    same_athlete[1:] = (athlete[1:] == athlete[:-1]).all(axis=1)
+    # Rows without a Name or Date of Birth are untracked: no velocity from or to them
+    same_athlete &= (athlete >= 0).all(axis=1)
+    sorted_dates = test_date.to_numpy()[order]
+    sorted_height = height[order]
+    years = np.full(len(order), np.nan)
+    years[1:] = (sorted_dates[1:] - sorted_dates[:-1]) / np.timedelta64(1, 'D') / 365.25
+    gained = np.full(len(order), np.nan)
+    gained[1:] = sorted_height[1:] - sorted_height[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sorted_velocity = np.where(same_athlete & (years > 0), gained / years, np.nan)
+    velocity = np.empty(len(order))
+    velocity[order] = sorted_velocity
+
+    # Anything but Male uses the female curve, as for Biological Age
+    index = ref.biological_age_index
+    is_male = encode_gender(results['Gender']) == GENDER_CODES["Male"]
+    phv_age = np.where(is_male, index.peak_velocity_age("Male"), index.peak_velocity_age("Female"))
+    years_from_phv = pd.to_numeric(results['Biological Age'], errors='coerce').to_numpy(dtype=float) - phv_age
+
+    growth = results.copy()
+    growth['Height Velocity (cm/yr)'] = velocity
+    growth['Years from PHV'] = years_from_phv
+    growth['Age at PHV'] = pd.to_numeric(results['Chronological Age'], errors='coerce').to_numpy() - years_from_phv
+    return growth
@@ -0,0 +1,128 @@
+"""
+Longitudinal store of scored assessments in SQLite, keyed by athlete
+(Name + Date of Birth) and Test Date, so repeat uploads only recompute
+rows that are new or whose inputs changed.
+"""
+
+import os
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from .engine import INPUT_COLUMNS, RESULT_COLUMNS, calculate_maturation_batch
+from .reference import get_reference_data
+from .validation import NUMERIC_COLUMNS, validate_upload
+
+# Default store, next to the reference workbook
+HISTORY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'maturation_history.sqlite')
+
+KEY_COLUMNS = ['Name', 'Date of Birth', 'Test Date']
+HASH_COLUMN = 'Input Hash'
+VERSION_COLUMN = 'Reference Version'
+
+_TEXT_COLUMNS = {'Name', 'Gender', 'Date of Birth', 'Test Date', 'Maturity Status', 'Timing', 'Alt. Timing',
+                 VERSION_COLUMN}
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def normalised_inputs(df):
+    """
+    Template columns of a validated upload in their stored form: dates as
+    yyyy-mm-dd text and measurements as floats, so equal inputs hash equally
+    whatever format they were uploaded in.
+    """
+    inputs = pd.DataFrame({
+        'Name': df['Name'].astype(str),
+        'Gender': df['Gender'],
+        'Date of Birth': df['Date of Birth'].dt.strftime('%Y-%m-%d'),
+        'Test Date': df['Test Date'].dt.strftime('%Y-%m-%d'),
+    }, index=df.index)
+    for col in NUMERIC_COLUMNS:
+        inputs[col] = pd.to_numeric(df[col], errors='coerce')
+    return inputs[INPUT_COLUMNS]
+
+
+def input_hashes(inputs):
+    """64-bit hash of every input row, as signed integers SQLite can hold."""
+    return pd.util.hash_pandas_object(inputs, index=False).to_numpy().view(np.int64)
+
+
+class HistoryStore:
+    """SQLite table of every assessment, one row per Name, Date of Birth and Test Date."""
+
+    TABLE = 'assessments'
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self.columns = RESULT_COLUMNS + [HASH_COLUMN, VERSION_COLUMN]
+        with closing(self._connect()) as conn, conn:
+            definitions = ', '.join(
+                f"{_quote(col)} {'TEXT' if col in _TEXT_COLUMNS else 'INTEGER' if col == HASH_COLUMN else 'REAL'}"
+                for col in self.columns
+            )
+            keys = ', '.join(_quote(col) for col in KEY_COLUMNS)
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {self.TABLE} ({definitions}, PRIMARY KEY ({keys}))")
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def _load_athletes(self, conn, athletes):
+        """Every stored assessment of the given (Name, Date of Birth) pairs."""
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS upload_athletes (name TEXT, dob TEXT)")
+        conn.execute("DELETE FROM upload_athletes")
+        conn.executemany("INSERT INTO upload_athletes VALUES (?, ?)", athletes.itertuples(index=False, name=None))
+        selected = ', '.join(f"a.{_quote(col)}" for col in self.columns)
+        query = (f"SELECT {selected} FROM {self.TABLE} a JOIN upload_athletes u "
+                 f"ON a.{_quote('Name')} = u.name AND a.{_quote('Date of Birth')} = u.dob")
+        return pd.read_sql_query(query, conn)
+
+    def save(self, conn, results):
+        """Insert or replace scored assessments (RESULT_COLUMNS plus hash and version)."""
+        placeholders = ', '.join('?' for _ in self.columns)
+        rows = results[self.columns].astype(object).where(results[self.columns].notna(), None)
+        conn.executemany(f"INSERT OR REPLACE INTO {self.TABLE} VALUES ({placeholders})",
+                         rows.itertuples(index=False, name=None))
+
+    def score(self, df, ref=None):
+        """
+        Validate and score an upload against the store. Rows whose inputs
+        and reference version match a stored assessment reuse it; the rest
+        are scored with the batch engine and saved. Rows missing a Name or
+        date cannot be tracked and are scored but not saved.
+        Returns (history, report, computed): history holds every stored
+        assessment of the uploaded athletes ordered by athlete and Test Date,
+        report the validation report and computed the number of rows scored.
+        """
+        if ref is None:
+            ref = get_reference_data()
+        df, report = validate_upload(df, ref)
+        inputs = normalised_inputs(df)
+        inputs[HASH_COLUMN] = input_hashes(inputs)
+        trackable = df['Name'].notna() & inputs[['Date of Birth', 'Test Date']].notna().all(axis=1)
+        inputs = inputs[trackable].drop_duplicates(KEY_COLUMNS, keep='last')
+
+        with closing(self._connect()) as conn, conn:
+            stored = self._load_athletes(conn, inputs[['Name', 'Date of Birth']].drop_duplicates())
+            known = inputs.merge(stored[KEY_COLUMNS + [HASH_COLUMN, VERSION_COLUMN]], on=KEY_COLUMNS,
+                                 how='left', suffixes=('', ' Stored'), indicator=True)
+            unchanged = ((known['_merge'] == 'both') & (known[HASH_COLUMN] == known[f'{HASH_COLUMN} Stored'])
+                         & (known[VERSION_COLUMN] == ref.version)).to_numpy()
+            stale = inputs.index[~unchanged]
+
+            results = calculate_maturation_batch(df.loc[stale], ref)
+            results['Name'] = inputs.loc[stale, 'Name']
+            results[HASH_COLUMN] = inputs.loc[stale, HASH_COLUMN]
+            results[VERSION_COLUMN] = ref.version
+            self.save(conn, results)
+            history = self._load_athletes(conn, inputs[['Name', 'Date of Birth']].drop_duplicates())
+
+        untracked = calculate_maturation_batch(df[~trackable], ref)
+        computed = len(stale) + len(untracked)
+        history = pd.concat([history[RESULT_COLUMNS], untracked[RESULT_COLUMNS]], ignore_index=True)
+        history = history.sort_values(KEY_COLUMNS, kind='stable', ignore_index=True)
+        return history, report, computed
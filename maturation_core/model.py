@@ -0,0 +1,228 @@
+"""
+Single-athlete maturation model, one function per column of the workbook's
+Input sheet. Numeric results are float64 and NaN when an input is missing;
+the categorical results (timing, maturity status) are "" when missing.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .reference import encode_gender, get_reference_data
+
+
+def chronological_age(dob, test_date):
+    """Excel: =IF(C2="","",YEARFRAC(C2,D2))"""
+    if pd.isna(dob) or pd.isna(test_date):
+        return np.nan
+    days_diff = (test_date - dob).days
+    return days_diff / 365.25
+
+def rounded_age(age):
+    """Excel: =MROUND(E2, 0.5)"""
+    if pd.isna(age):
+        return np.nan
+    return round(age / 0.5) * 0.5
+
+def kg_to_lbs(kg):
+    """Excel: =G2*2.205"""
+    if pd.isna(kg):
+        return np.nan
+    return float(kg) * 2.205
+
+def cm_to_inches(cm):
+    """Excel: =I2*0.393701"""
+    if pd.isna(cm):
+        return np.nan
+    return float(cm) * 0.393701
+
+def inches_to_cm(inches):
+    """Excel: =O2*2.54"""
+    if pd.isna(inches):
+        return np.nan
+    return float(inches) * 2.54
+
+def get_height_coefficient(gender, rounded_age):
+    """Excel: IF/INDEX/MATCH formula for height coefficient"""
+    return get_reference_data().coefficients.get(gender, rounded_age, 'height')
+
+def get_weight_coefficient(gender, rounded_age):
+    """Excel: IF/INDEX/MATCH formula for weight coefficient"""
+    return get_reference_data().coefficients.get(gender, rounded_age, 'weight')
+
+def get_midparent_coefficient(gender, rounded_age):
+    """Excel: IF/INDEX/MATCH formula for midparent coefficient"""
+    return get_reference_data().coefficients.get(gender, rounded_age, 'midparent')
+
+def get_intersect(gender, rounded_age):
+    """Excel: IF/INDEX/MATCH formula for intersect value"""
+    return get_reference_data().coefficients.get(gender, rounded_age, 'intersect')
+
+def adjust_mother_height_inches(mother_height_inches):
+    """Excel: =2.803+(0.953*N2)"""
+    if pd.isna(mother_height_inches):
+        return np.nan
+    return 2.803 + (0.953 * mother_height_inches)
+
+def adjust_father_height_inches(father_height_inches):
+    """Excel: =2.316+(0.955*R2)"""
+    if pd.isna(father_height_inches):
+        return np.nan
+    return 2.316 + (0.955 * father_height_inches)
+
+def calculate_midparent_height_cm(adj_mother_cm, adj_father_cm):
+    """Excel: Average of adjusted parent heights"""
+    if pd.isna(adj_mother_cm) or pd.isna(adj_father_cm):
+        return np.nan
+    return (adj_mother_cm + adj_father_cm) / 2
+
+def calculate_midparent_inches(gender, midparent_cm):
+    """Excel: =IFS(B2="Male",U2*0.393701+2.5,B2="Female",U2*0.393701-2.5)"""
+    if pd.isna(midparent_cm):
+        return np.nan
+    inches = midparent_cm * 0.393701
+    if gender == "Male":
+        return inches + 2.5
+    elif gender == "Female":
+        return inches - 2.5
+    return np.nan
+
+def calculate_predicted_adult_height_cm(intersect, height_coef, height_cm, weight_coef, weight_kg, midparent_coef, midparent_cm):
+    """Excel: =X2+(J2*I2)+(L2*G2)+(V2*U2)"""
+    if any(pd.isna(x) for x in [intersect, height_coef, height_cm, weight_coef, weight_kg, midparent_coef, midparent_cm]):
+        return np.nan
+    return intersect + (height_coef * height_cm) + (weight_coef * weight_kg) + (midparent_coef * midparent_cm)
+
+def calculate_percent_predicted_height(current_height_cm, predicted_height_cm):
+    """Excel: =IF(Y2=" ", " ", (I2/Y2*100))"""
+    if pd.isna(current_height_cm) or pd.isna(predicted_height_cm) or predicted_height_cm == 0:
+        return np.nan
+    return (current_height_cm / predicted_height_cm) * 100
+
+def calculate_biological_age(gender, percent_predicted_height):
+    """
+    Excel: =IFS(
+        B2="Male", XLOOKUP(0, ABS(SA!$C$2:$C$218 - Input!Z2), SA!$A$2:$A$218, " ", 1),
+        B2="Female", XLOOKUP(0, ABS(SA!$E$2:$E$218 - Input!Z2), SA!$A$2:$A$218, " ", 1)
+    )
+    """
+    if pd.isna(percent_predicted_height):
+        return np.nan
+    index = get_reference_data().biological_age_index
+    return index.lookup(np.array([encode_gender(gender)]), np.array([percent_predicted_height], dtype=float))[0]
+
+def calculate_ba_ca(chronological_age, biological_age):
+    """Excel: =IF(E2=" ", " ",AA2-E2)"""
+    if pd.isna(chronological_age) or pd.isna(biological_age):
+        return np.nan
+    return biological_age - chronological_age
+
+def calculate_timing(ba_ca):
+    """Excel: =IFS(AB2=" "," ", AB2>0.5,"Early",AB2<=-0.5,"Late",AND(AB2>=-0.5,AB2<=0.5),"On Time")"""
+    if pd.isna(ba_ca):
+        return ""
+    if ba_ca > 0.5:
+        return "Early"
+    elif ba_ca <= -0.5:
+        return "Late"
+    else:
+        return "On Time"
+
+def calculate_alt_timing(ba_ca):
+    """Excel: =IFS(AB2=" "," ", AB2>1,"Early",AB2<=-1,"Late",AND(AB2>=-1,AB2<=1),"On Time")"""
+    if pd.isna(ba_ca):
+        return ""
+    if ba_ca > 1:
+        return "Early"
+    elif ba_ca <= -1:
+        return "Late"
+    else:
+        return "On Time"
+
+def calculate_maturity_status(percent_predicted_height):
+    """Excel: =IF(Z3<=88, "Pre-PHV", IF(Z3<=95, "Circa-PHV", "Post PHV"))"""
+    if pd.isna(percent_predicted_height):
+        return ""
+    if percent_predicted_height <= 88:
+        return "Pre-PHV"
+    elif percent_predicted_height <= 95:
+        return "Circa-PHV"
+    else:
+        return "Post PHV"
+
+def _error_bound(predicted_height_cm, rounded_age, quantile, sign):
+    if pd.isna(predicted_height_cm) or pd.isna(rounded_age):
+        return np.nan
+    error_value = get_reference_data().error_bands.resolve(np.array([rounded_age], dtype=float), [quantile])[0, 0]
+    return predicted_height_cm + sign * error_value
+
+def calculate_lower_bound_50(predicted_height_cm, rounded_age):
+    """Excel: =Y2 - IFERROR(INDEX(Errors!$B$2:$B$100, MATCH(F2 + 0.5, Errors!$A$2:$A$100, 0)), 0)"""
+    return _error_bound(predicted_height_cm, rounded_age, 0.5, -1)
+
+def calculate_upper_bound_50(predicted_height_cm, rounded_age):
+    """Excel: =Y2 + IFERROR(INDEX(Errors!$B$2:$B$100, MATCH(F2 + 0.5, Errors!$A$2:$A$100, 0)), 0)"""
+    return _error_bound(predicted_height_cm, rounded_age, 0.5, 1)
+
+def calculate_lower_bound_90(predicted_height_cm, rounded_age):
+    """Excel: =Y2 - IFERROR(INDEX(Errors!$C$2:$C$100, MATCH(F2 + 0.5, Errors!$A$2:$A$100, 0)), 0)"""
+    return _error_bound(predicted_height_cm, rounded_age, 0.9, -1)
+
+def calculate_upper_bound_90(predicted_height_cm, rounded_age):
+    """Excel: =Y2 + IFERROR(INDEX(Errors!$C$2:$C$100, MATCH(F2 + 0.5, Errors!$A$2:$A$100, 0)), 0)"""
+    return _error_bound(predicted_height_cm, rounded_age, 0.9, 1)
+
+
+def calculate_athlete(gender, test_date, dob, body_mass_kg, standing_height_cm, mothers_height_cm, fathers_height_cm):
+    """Every result column for one athlete (plus 'Rounded Age'), computed without caching."""
+    chrono_age = chronological_age(dob, test_date)
+    round_age = rounded_age(chrono_age)
+    adj_mother_cm = inches_to_cm(adjust_mother_height_inches(cm_to_inches(mothers_height_cm)))
+    adj_father_cm = inches_to_cm(adjust_father_height_inches(cm_to_inches(fathers_height_cm)))
+    predicted = calculate_predicted_adult_height_cm(
+        get_intersect(gender, round_age), get_height_coefficient(gender, round_age), standing_height_cm,
+        get_weight_coefficient(gender, round_age), body_mass_kg, get_midparent_coefficient(gender, round_age),
+        calculate_midparent_height_cm(adj_mother_cm, adj_father_cm),
+    )
+    percent = calculate_percent_predicted_height(standing_height_cm, predicted)
+    bio_age = calculate_biological_age(gender, percent)
+    ba_ca = calculate_ba_ca(chrono_age, bio_age)
+    return {
+        'Chronological Age': chrono_age,
+        'Rounded Age': round_age,
+        'Biological Age': bio_age,
+        'BA-CA': ba_ca,
+        'Predicted Adult Height (cm)': predicted,
+        'Percent of Adult Height': percent,
+        'Maturity Status': calculate_maturity_status(percent),
+        'Timing': calculate_timing(ba_ca),
+        'Alt. Timing': calculate_alt_timing(ba_ca),
+        '50% Lower Bound': calculate_lower_bound_50(predicted, round_age),
+        '50% Upper Bound': calculate_upper_bound_50(predicted, round_age),
+        '90% Lower Bound': calculate_lower_bound_90(predicted, round_age),
+        '90% Upper Bound': calculate_upper_bound_90(predicted, round_age),
+    }
+
+
+# Distinct athletes whose full result is kept by score_athlete
+ATHLETE_CACHE_SIZE = 1024
+
+@lru_cache(maxsize=ATHLETE_CACHE_SIZE)
+def _score_athlete(version, gender, test_date, dob, body_mass_kg, standing_height_cm, mothers_height_cm,
+                   fathers_height_cm):
+    return calculate_athlete(gender, test_date, dob, body_mass_kg, standing_height_cm, mothers_height_cm,
+                             fathers_height_cm)
+
+def score_athlete(gender, test_date, dob, body_mass_kg, standing_height_cm, mothers_height_cm, fathers_height_cm):
+    """
+    Every result column for one athlete, memoised in an LRU of
+    ATHLETE_CACHE_SIZE entries keyed on the inputs and the workbook version.
+    """
+    version = get_reference_data().version
+    return dict(_score_athlete(version, gender, test_date, dob, body_mass_kg, standing_height_cm,
+                               mothers_height_cm, fathers_height_cm))
+
+def athlete_cache_info():
+    """Hits, misses and size of the score_athlete cache (functools CacheInfo)."""
+    return _score_athlete.cache_info()
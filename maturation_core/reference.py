@@ -0,0 +1,306 @@
+"""Reference sheets of Maturation_calculator.xlsx and their compiled lookup tables."""
+
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .timing import timed
+
+# Reference workbook shared by every page and batch tool
+WORKBOOK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Maturation_calculator.xlsx')
+
+# Binary copy of the reference sheets, rebuilt whenever the workbook's hash changes
+CACHE_FORMAT = 1
+REFERENCE_SHEETS = ('Errors', 'SA', 'Metric coefficients')
+
+# Gender codes used to index the compiled tables (-1 = unknown)
+GENDER_CODES = {"Male": 0, "Female": 1}
+
+# 'Metric coefficients' layout: age column and coefficient columns per gender
+COEFFICIENT_NAMES = ('intersect', 'height', 'weight', 'midparent')
+COEFFICIENT_COLUMNS = {
+    "Male": ('Age', ['Beta', 'Stature (in)', 'Weight (lb)', 'Midparent Stature (in)']),
+    "Female": ('Age.1', ['Intersect', 'Height', 'Weight', 'Md parent']),
+}
+
+_lock = threading.Lock()
+_store = {}
+
+
+def encode_gender(gender):
+    """Map a gender value or array of values to GENDER_CODES (-1 when unknown)."""
+    if np.ndim(gender) == 0:
+        return GENDER_CODES.get(gender, -1)
+    return pd.Series(np.asarray(gender, dtype=object)).map(GENDER_CODES).fillna(-1).to_numpy(dtype=np.int8)
+
+
+class CoefficientTable:
+    """
+    'Metric coefficients' compiled into a dense array indexed by
+    [gender code, rounded_age * 2 - offset, coefficient]. Ages missing from the
+    sheet hold NaN, so a lookup never falls back to another row.
+    """
+
+    def __init__(self, metric_coef):
+        slots_by_gender = {}
+        for sex, (age_col, _) in COEFFICIENT_COLUMNS.items():
+            ages = metric_coef[age_col].to_numpy(dtype=float)
+            rows = np.flatnonzero(~np.isnan(ages))
+            slots_by_gender[sex] = (np.rint(ages[rows] * 2).astype(int), rows)
+        all_slots = np.concatenate([slots for slots, _ in slots_by_gender.values()])
+        self.offset = int(all_slots.min())
+        self.values = np.full((len(GENDER_CODES), all_slots.max() - self.offset + 1, len(COEFFICIENT_NAMES)), np.nan)
+        for sex, (slots, rows) in slots_by_gender.items():
+            # MATCH(..., 0) takes the first row with a given age
+            slots, first = np.unique(slots, return_index=True)
+            value_cols = COEFFICIENT_COLUMNS[sex][1]
+            self.values[GENDER_CODES[sex], slots - self.offset] = metric_coef[value_cols].to_numpy(dtype=float)[rows[first]]
+
+    @timed('coefficient_lookup')
+    def lookup(self, gender_codes, rounded_ages):
+        """Gather all coefficients for a batch: array of shape (n, len(COEFFICIENT_NAMES))."""
+        gender_codes = np.asarray(gender_codes)
+        half_years = np.asarray(rounded_ages, dtype=float) * 2
+        with np.errstate(invalid='ignore'):
+            slots = np.where(np.isfinite(half_years), np.rint(half_years), -1).astype(int) - self.offset
+        valid = ((gender_codes >= 0) & (slots >= 0) & (slots < self.values.shape[1])
+                 & (half_years == slots + self.offset))
+        result = np.full((len(gender_codes), len(COEFFICIENT_NAMES)), np.nan)
+        result[valid] = self.values[gender_codes[valid], slots[valid]]
+        return result
+
+    def get(self, gender, rounded_age, name):
+        """Single coefficient by name, NaN when gender or age is not in the sheet."""
+        row = self.lookup(np.array([encode_gender(gender)]), np.array([rounded_age], dtype=float))
+        return row[0, COEFFICIENT_NAMES.index(name)]
+
+
+class BiologicalAgeIndex:
+    """
+    Sorted '%PAH Males' / '%PAH females' columns of the SA sheet, so a whole
+    vector of %PAH values resolves to the nearest SA age with searchsorted.
+    Ties go to the first SA row, as XLOOKUP(0, ABS(...), ..., 1) does.
+    """
+
+    PAH_COLUMNS = {"Male": '%PAH Males', "Female": '%PAH females'}
+    HEIGHT_COLUMNS = {"Male": 'ht', "Female": 'ht.1'}
+
+    # peak_velocity_age: ages searched for the pre-pubertal velocity minimum, the
+    # last age of the spurt and the share of peak velocity counted as the peak
+    TAKE_OFF_AGES = (8, 12)
+    SPURT_END = 16
+    PHV_TOLERANCE = 0.05
+
+    def __init__(self, sa_df):
+        self.ages = sa_df['Age'].to_numpy(dtype=float)
+        self.sa_height = {sex: sa_df[col].to_numpy(dtype=float) for sex, col in self.HEIGHT_COLUMNS.items()}
+        self.sa_pah = {}
+        self.sorted_pah = {}
+        self.first_rows = {}
+        for sex, pah_col in self.PAH_COLUMNS.items():
+            pah = sa_df[pah_col].to_numpy(dtype=float)
+            self.sa_pah[sex] = pah
+            rows = np.flatnonzero(~np.isnan(pah))
+            order = rows[np.argsort(pah[rows], kind='stable')]
+            sorted_pah = pah[order]
+            # For duplicated %PAH values keep the earliest SA row
+            first_rows = order[np.searchsorted(sorted_pah, sorted_pah, side='left')]
+            self.sorted_pah[sex] = sorted_pah
+            self.first_rows[sex] = first_rows
+
+    def peak_velocity_age(self, sex):
+        """
+        SA age of peak height velocity: the centre of the ages where the
+        velocity of the sex's SA height curve is within PHV_TOLERANCE of its
+        pubertal maximum.
+
+        Childhood velocity falls to a pre-pubertal minimum (the take-off,
+        searched between TAKE_OFF_AGES) before the spurt, so the maximum is
+        searched from the take-off to SPURT_END. The female curve has a
+        plateau of about 5.7 cm/yr from 9.5 to 12.5 rather than a peak, so
+        a single argmax jumps between plateau rows with any smoothing; the
+        centre of the near-peak ages moves less than 0.1 year for
+        tolerances from 3% to 15%, for either sex.
+        """
+        velocity = np.gradient(self.sa_height[sex], self.ages)
+        low, high = self.TAKE_OFF_AGES
+        window = np.flatnonzero((self.ages >= low) & (self.ages < high))
+        take_off = window[np.nanargmin(velocity[window])]
+        spurt = np.flatnonzero((self.ages >= self.ages[take_off]) & (self.ages <= self.SPURT_END))
+        near_peak = spurt[velocity[spurt] >= (1 - self.PHV_TOLERANCE) * np.nanmax(velocity[spurt])]
+        return (self.ages[near_peak[0]] + self.ages[near_peak[-1]]) / 2
+
+    def _nearest_rows(self, sex, pct):
+        sorted_pah = self.sorted_pah[sex]
+        first_rows = self.first_rows[sex]
+        right = np.searchsorted(sorted_pah, pct, side='left')
+        left = np.maximum(right - 1, 0)
+        right = np.minimum(right, len(sorted_pah) - 1)
+        left_diff = np.abs(sorted_pah[left] - pct)
+        right_diff = np.abs(sorted_pah[right] - pct)
+        left_rows = first_rows[left]
+        right_rows = first_rows[right]
+        take_left = (left_diff < right_diff) | ((left_diff == right_diff) & (left_rows < right_rows))
+        return np.where(take_left, left_rows, right_rows)
+
+    @timed('biological_age_lookup')
+    def lookup(self, gender_codes, percent_predicted):
+        """Biological age per row; anything but Male uses the female curve, like the scalar path."""
+        gender_codes = np.asarray(gender_codes)
+        percent_predicted = np.asarray(percent_predicted, dtype=float)
+        result = np.full(len(percent_predicted), np.nan)
+        valid = ~np.isnan(percent_predicted)
+        is_male = gender_codes == GENDER_CODES["Male"]
+        for sex, mask in (("Male", valid & is_male), ("Female", valid & ~is_male)):
+            if mask.any():
+                result[mask] = self.ages[self._nearest_rows(sex, percent_predicted[mask])]
+        return result
+
+
+class ErrorBands:
+    """
+    Errors sheet resolved once per rounded age for every quantile column
+    (0.5, 0.9, ...), giving all lower/upper bounds of a batch in one search.
+    """
+
+    def __init__(self, errors_df):
+        self.ages = errors_df['Age'].to_numpy(dtype=float)
+        self.quantiles = [col for col in errors_df.columns if col != 'Age']
+        self.errors = errors_df[self.quantiles].to_numpy(dtype=float)
+
+    def resolve(self, rounded_ages, quantiles=None):
+        """
+        Error values of shape (n, len(quantiles)) for the Errors row matching
+        rounded_age + 0.5; 0 past the end of the sheet, NaN for a missing age.
+        """
+        quantiles = self.quantiles if quantiles is None else list(quantiles)
+        columns = [self.quantiles.index(q) for q in quantiles]
+        rounded_ages = np.asarray(rounded_ages, dtype=float)
+        missing = np.isnan(rounded_ages)
+        row_idx = np.searchsorted(self.ages, np.where(missing, np.inf, rounded_ages + 0.5))
+        found = row_idx < len(self.ages)
+        errors = np.zeros((len(rounded_ages), len(columns)))
+        errors[found] = self.errors[row_idx[found]][:, columns]
+        errors[missing] = np.nan
+        return errors
+
+    @timed('error_bounds')
+    def bounds(self, predicted_height, rounded_ages, quantiles=None):
+        """{quantile: (lower, upper)} around the predicted adult height."""
+        quantiles = self.quantiles if quantiles is None else list(quantiles)
+        errors = self.resolve(rounded_ages, quantiles)
+        predicted_height = np.asarray(predicted_height, dtype=float)
+        return {
+            q: (predicted_height - errors[:, i], predicted_height + errors[:, i])
+            for i, q in enumerate(quantiles)
+        }
+
+
+class ReferenceData:
+    """Parsed reference sheets of the maturation workbook."""
+
+    def __init__(self, errors_df, sa_df, metric_coef, version):
+        self.errors_df = errors_df
+        self.sa_df = sa_df
+        self.metric_coef = metric_coef
+        self.version = version
+        self.coefficients = CoefficientTable(metric_coef)
+        self.biological_age_index = BiologicalAgeIndex(sa_df)
+        self.error_bands = ErrorBands(errors_df)
+
+
+def workbook_hash(path=WORKBOOK_PATH):
+    """SHA-256 of the workbook bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path_for(path=WORKBOOK_PATH):
+    """Location of the binary sheet cache: the workbook path with a .npz suffix."""
+    return os.path.splitext(path)[0] + '.npz'
+
+
+def _read_cache(cache_path, version):
+    """Sheets from the .npz cache, or None when it is missing, stale or unreadable."""
+    try:
+        with np.load(cache_path, allow_pickle=False) as archive:
+            manifest = json.loads(str(archive['manifest']))
+            if manifest.get('format') != CACHE_FORMAT or manifest.get('version') != version:
+                return None
+            return {
+                sheet: pd.DataFrame(archive[f'sheet{i}'], columns=manifest['columns'][i])
+                for i, sheet in enumerate(REFERENCE_SHEETS)
+            }
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_cache(cache_path, sheets, version):
+    """Write the sheets atomically; a read-only install just keeps using the xlsx."""
+    manifest = {
+        'format': CACHE_FORMAT,
+        'version': version,
+        'columns': [list(sheets[sheet].columns) for sheet in REFERENCE_SHEETS],
+    }
+    arrays = {f'sheet{i}': sheets[sheet].to_numpy(dtype=float) for i, sheet in enumerate(REFERENCE_SHEETS)}
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, manifest=np.array(json.dumps(manifest)), **arrays)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def build_cache(path=WORKBOOK_PATH):
+    """Parse the workbook and (re)write its .npz cache; returns the cache path."""
+    version = workbook_hash(path)
+    sheets = pd.read_excel(path, sheet_name=list(REFERENCE_SHEETS))
+    cache_path = cache_path_for(path)
+    _write_cache(cache_path, sheets, version)
+    return cache_path
+
+
+def _parse_workbook(path, version):
+    cache_path = cache_path_for(path)
+    sheets = _read_cache(cache_path, version)
+    if sheets is None:
+        sheets = pd.read_excel(path, sheet_name=list(REFERENCE_SHEETS))
+        _write_cache(cache_path, sheets, version)
+    return ReferenceData(sheets['Errors'], sheets['SA'], sheets['Metric coefficients'], version)
+
+
+def get_reference_data(path=WORKBOOK_PATH):
+    """
+    Return the workbook's reference sheets, parsed once per process.
+    The workbook is only re-parsed when its mtime/size changes and its
+    content hash differs from the one already loaded. Sheets come from the
+    .npz cache next to the workbook when its hash matches; otherwise the
+    xlsx is read with openpyxl and the cache rewritten.
+    """
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        entry = _store.get(path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        version = workbook_hash(path)
+        if entry is not None and entry[1].version == version:
+            data = entry[1]
+        else:
+            data = _parse_workbook(path, version)
+        _store[path] = (signature, data)
+        return data
+
+
+def get_coefficient_table(path=WORKBOOK_PATH):
+    """Compiled 'Metric coefficients' lookup table from the shared store."""
+    return get_reference_data(path).coefficients
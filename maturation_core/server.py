@@ -0,0 +1,256 @@
+"""
+Local HTTP scoring service on the standard library's ThreadingHTTPServer.
+
+    POST /score        one athlete as a JSON object of template columns
+    POST /score/bulk   JSON array of athletes, or a CSV body (Content-Type: text/csv)
+    GET  /metrics      request latency and scoring throughput
+    GET  /health       reference workbook version
+
+Concurrent /score requests are gathered by a MicroBatcher and scored with
+one batch engine call. Reference tables are loaded before the server starts.
+"""
+
+import io
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from .engine import INPUT_COLUMNS, calculate_maturation_batch
+from .reference import WORKBOOK_PATH, get_reference_data
+from .validation import validate_upload
+
+# Longest a single request waits for others to share its batch, and the batch cap
+BATCH_WINDOW_MS = 5
+MAX_BATCH = 1024
+
+# Latencies kept per endpoint for the percentiles in /metrics
+LATENCY_WINDOW = 10_000
+
+
+def score_records(df, ref):
+    """Validate and score a frame of template columns; returns (results, report)."""
+    df, report = validate_upload(df, ref)
+    return calculate_maturation_batch(df, ref), report
+
+
+def coerce_record(record, position=None):
+    """
+    Check one athlete before it is scored: a JSON object whose template
+    values are text, numbers or null. Name is kept as text. Raises
+    ValueError naming the athlete (position in a bulk request) otherwise.
+    """
+    where = "" if position is None else f"Athlete {position}: "
+    if not isinstance(record, dict):
+        raise ValueError(f"{where}Expected a JSON object with the template columns")
+    bad = [col for col in INPUT_COLUMNS
+           if record.get(col) is not None and not isinstance(record[col], (str, int, float))]
+    if bad:
+        raise ValueError(f"{where}Expected text, a number or null for: {', '.join(bad)}")
+    record = dict(record)
+    if record.get('Name') is not None:
+        record['Name'] = str(record['Name'])
+    return record
+
+
+def _records(frame):
+    """DataFrame rows as JSON-ready dicts, NaN as null."""
+    return json.loads(frame.to_json(orient='records'))
+
+
+class MicroBatcher:
+    """
+    Queue of single-athlete requests drained by one thread: whatever arrives
+    within batch_window_ms of the first request (up to max_batch) is scored
+    together and each caller's Future gets its own row back. A batch that
+    fails is scored again one athlete at a time, so only the athlete that
+    caused the failure gets the exception.
+    """
+
+    def __init__(self, ref, metrics, batch_window_ms=BATCH_WINDOW_MS, max_batch=MAX_BATCH):
+        self.ref = ref
+        self.metrics = metrics
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, record):
+        """Future resolving to (result dict, list of problems) for one athlete."""
+        future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._score(batch)
+
+    def _score(self, batch):
+        try:
+            df = pd.DataFrame([record for record, _ in batch], columns=INPUT_COLUMNS)
+            results, report = score_records(df, self.ref)
+            self.metrics.record_batch(len(batch))
+            rows = _records(results)
+            problems = report.assign(Position=report['Row'] - 1)
+            for i, (_, future) in enumerate(batch):
+                own = problems[problems['Position'] == i][['Column', 'Reason']]
+                future.set_result((rows[i], _records(own)))
+        except Exception as e:
+            pending = [item for item in batch if not item[1].done()]
+            if len(batch) > 1:
+                for item in pending:
+                    self._score([item])
+            else:
+                for _, future in pending:
+                    future.set_exception(e)
+
+
+class Metrics:
+    """Thread-safe request counts, latency percentiles and rows scored per second."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = {}
+        self.latencies = {}
+        self.rows_scored = 0
+        self.batches = 0
+        self.batched_rows = 0
+
+    def record_request(self, endpoint, seconds, rows):
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self.latencies.setdefault(endpoint, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+            self.rows_scored += rows
+
+    def record_batch(self, size):
+        with self._lock:
+            self.batches += 1
+            self.batched_rows += size
+
+    def snapshot(self):
+        with self._lock:
+            uptime = time.time() - self.started
+            latency = {}
+            for endpoint, values in self.latencies.items():
+                p50, p95, p99 = np.percentile(np.fromiter(values, dtype=float), [50, 95, 99]) * 1000
+                latency[endpoint] = {'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99}
+            return {
+                'uptime_s': uptime,
+                'requests': dict(self.requests),
+                'latency': latency,
+                'rows_scored': self.rows_scored,
+                'rows_per_s': self.rows_scored / uptime if uptime else 0.0,
+                'micro_batches': self.batches,
+                'mean_micro_batch': self.batched_rows / self.batches if self.batches else 0.0,
+            }
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    """Routes requests to the server's ref, batcher and metrics."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type="application/json"):
+        if content_type == "application/json":
+            body = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._send(200, self.server.metrics.snapshot())
+        elif self.path == "/health":
+            self._send(200, {'status': 'ok', 'reference_version': self.server.ref.version})
+        else:
+            self._send(404, {'error': f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        started = time.perf_counter()
+        try:
+            if self.path == "/score":
+                rows = self._score_one()
+            elif self.path == "/score/bulk":
+                rows = self._score_bulk()
+            else:
+                self._send(404, {'error': f"Unknown path {self.path}"})
+                return
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+            return
+        except Exception as e:
+            self.log_error("Scoring failed: %r", e)
+            self._send(500, {'error': f"Scoring failed: {e}"})
+            return
+        self.server.metrics.record_request(self.path, time.perf_counter() - started, rows)
+
+    def _score_one(self):
+        record = coerce_record(json.loads(self._body()))
+        missing_columns = [col for col in INPUT_COLUMNS if col not in record]
+        if missing_columns:
+            raise ValueError(f"Missing columns: {', '.join(missing_columns)}")
+        result, problems = self.server.batcher.submit(record).result()
+        self._send(200, {'result': result, 'problems': problems})
+        return 1
+
+    def _score_bulk(self):
+        body = self._body()
+        is_csv = self.headers.get("Content-Type", "").startswith("text/csv")
+        if is_csv:
+            df = pd.read_csv(io.BytesIO(body), dtype={'Name': str})
+        else:
+            records = json.loads(body)
+            if not isinstance(records, list):
+                raise ValueError("Expected a JSON array of athletes")
+            df = pd.DataFrame([coerce_record(record, i) for i, record in enumerate(records)])
+        results, report = score_records(df, self.server.ref)
+        if is_csv:
+            self._send(200, results.to_csv(index=False).encode('utf-8'), "text/csv")
+        else:
+            self._send(200, {'results': _records(results), 'report': _records(report)})
+        return len(results)
+
+
+class ScoringServer(ThreadingHTTPServer):
+    """Threaded server with a listen backlog sized for bursts of concurrent clients."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(host="127.0.0.1", port=8000, workbook_path=WORKBOOK_PATH, batch_window_ms=BATCH_WINDOW_MS,
+                max_batch=MAX_BATCH, verbose=False):
+    """ThreadingHTTPServer with the reference data loaded and the micro-batcher running."""
+    server = ScoringServer((host, port), ScoringHandler)
+    server.ref = get_reference_data(workbook_path)
+    server.metrics = Metrics()
+    server.batcher = MicroBatcher(server.ref, server.metrics, batch_window_ms, max_batch)
+    server.verbose = verbose
+    return server
@@ -0,0 +1,221 @@
+"""Chunked scoring of large group uploads (CSV, Parquet or Arrow IPC) with flat memory use."""
+
+import os
+
+import pandas as pd
+
+from .engine import RESULT_COLUMNS, calculate_maturation_batch
+from .timing import stage
+from .validation import REPORT_COLUMNS, validate_upload
+
+# Input rows read, scored and written per block
+CHUNK_ROWS = 50_000
+
+# Result rows kept in memory for display
+PREVIEW_ROWS = 10_000
+
+# File formats by suffix (anything else is read as CSV) and the suffix written for each
+FORMAT_SUFFIXES = {'.parquet': 'parquet', '.pq': 'parquet', '.arrow': 'arrow', '.feather': 'arrow', '.ipc': 'arrow'}
+OUTPUT_SUFFIXES = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow', 'xlsx': '.xlsx'}
+
+_TEXT_RESULT_COLUMNS = ('Name', 'Gender', 'Maturity Status', 'Timing', 'Alt. Timing')
+_DATE_RESULT_COLUMNS = ('Date of Birth', 'Test Date')
+
+
+def file_format_of(path):
+    """'parquet' for .parquet/.pq paths, 'arrow' for .arrow/.feather/.ipc, otherwise 'csv'."""
+    return FORMAT_SUFFIXES.get(os.path.splitext(str(path))[1].lower(), 'csv')
+
+
+def _pyarrow(file_format):
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(f"{file_format.capitalize()} files require pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def result_schema():
+    """Arrow schema of RESULT_COLUMNS: text, date32 dates and float64 numbers."""
+    pa = _pyarrow('arrow')
+    return pa.schema([
+        (col, pa.string() if col in _TEXT_RESULT_COLUMNS else pa.date32() if col in _DATE_RESULT_COLUMNS
+         else pa.float64())
+        for col in RESULT_COLUMNS
+    ])
+
+
+def _arrow_batches(source, chunk_rows):
+    """Record batches of an Arrow IPC file or stream, sliced to at most chunk_rows rows."""
+    pa = _pyarrow('arrow')
+    if isinstance(source, (str, os.PathLike)):
+        source = pa.OSFile(str(source))
+    try:
+        reader = pa.ipc.open_file(source)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        source.seek(0)
+        batches = pa.ipc.open_stream(source)
+    for batch in batches:
+        for offset in range(0, batch.num_rows, chunk_rows):
+            yield batch.slice(offset, chunk_rows)
+
+
+def read_chunks(source, chunk_rows=CHUNK_ROWS, file_format='csv'):
+    """
+    Yield blocks of at most chunk_rows rows of a Group_template source.
+    Parquet and Arrow columns keep their types: date columns arrive as
+    datetime64 and are not parsed again.
+    """
+    if file_format in ('parquet', 'arrow'):
+        pa = _pyarrow(file_format)
+        if file_format == 'parquet':
+            batches = pa.parquet.ParquetFile(source).iter_batches(batch_size=chunk_rows)
+        else:
+            batches = _arrow_batches(source, chunk_rows)
+        start = 0
+        for batch in batches:
+            chunk = batch.to_pandas(date_as_object=False)
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield chunk
+    else:
+        yield from pd.read_csv(source, dtype={'Name': str}, chunksize=chunk_rows)
+
+
+def iter_scored_chunks(source, chunk_rows=CHUNK_ROWS, ref=None, file_format='csv', dates_as_text=True):
+    """
+    Read a Group_template source in blocks of chunk_rows and yield
+    (results, report) for each block, report being its validation report.
+    """
+    chunks = read_chunks(source, chunk_rows, file_format)
+    while True:
+        with stage('read_input'):
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        chunk, report = validate_upload(chunk, ref)
+        yield calculate_maturation_batch(chunk, ref, dates_as_text=dates_as_text), report
+
+
+def encode_block(block, output_format='csv', header=True):
+    """
+    A results block ready for ResultWriter: CSV bytes, an Arrow table for
+    Parquet and Arrow, or the block itself for xlsx. Dates may be datetime64
+    (written to CSV as YYYY-MM-DD) or 'YYYY-MM-DD' text, and text columns
+    any type (numeric names from a typed upload are written as text).
+    Raises ValueError when the block does not fit the result schema.
+    """
+    if output_format == 'csv':
+        return block.to_csv(index=False, header=header, date_format='%Y-%m-%d').encode('utf-8')
+    if output_format == 'xlsx':
+        return block
+    pa = _pyarrow(output_format)
+    columns = {col: block[col].astype('string') for col in _TEXT_RESULT_COLUMNS}
+    for col in _DATE_RESULT_COLUMNS:
+        if not pd.api.types.is_datetime64_any_dtype(block[col]):
+            columns[col] = pd.to_datetime(block[col], format='%Y-%m-%d')
+    try:
+        return pa.Table.from_pandas(block[RESULT_COLUMNS].assign(**columns), schema=result_schema(),
+                                    preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        raise ValueError(f"Results could not be written as {output_format}: {e}") from e
+
+
+class ResultWriter:
+    """
+    Appends encoded results blocks to a binary file object: CSV bytes as
+    they are, Arrow tables as Parquet row groups or Arrow IPC record batches,
+    and xlsx blocks to a write-only workbook with a sheet per Maturity Status.
+    close() finishes a columnar file or workbook, even when empty.
+    """
+
+    def __init__(self, output, output_format='csv'):
+        self.output = output
+        self.output_format = output_format
+        self._writer = None
+
+    def _columnar_writer(self):
+        if self._writer is None:
+            if self.output_format == 'xlsx':
+                from .xlsx import StatusWorkbookWriter
+                self._writer = StatusWorkbookWriter(self.output)
+                return self._writer
+            pa = _pyarrow(self.output_format)
+            if self.output_format == 'parquet':
+                self._writer = pa.parquet.ParquetWriter(self.output, result_schema())
+            else:
+                self._writer = pa.ipc.new_file(self.output, result_schema())
+        return self._writer
+
+    def write(self, encoded):
+        if self.output_format == 'csv':
+            self.output.write(encoded)
+        elif self.output_format == 'xlsx':
+            self._columnar_writer().write(encoded)
+        else:
+            self._columnar_writer().write_table(encoded)
+
+    def close(self):
+        if self.output_format != 'csv':
+            self._columnar_writer().close()
+
+
+def _source_size(source):
+    position = source.tell()
+    size = source.seek(0, os.SEEK_END)
+    source.seek(position)
+    return size
+
+
+def score_csv_in_chunks(source, output, chunk_rows=CHUNK_ROWS, ref=None, on_progress=None,
+                        preview_rows=PREVIEW_ROWS, file_format=None, output_format='csv', report_rows=None,
+                        on_block=None):
+    """
+    Score a CSV, Parquet or Arrow source (path or binary file object) block
+    by block, appending each results block to the binary `output` as CSV,
+    Parquet, Arrow IPC or xlsx (nothing is written when output is None, for
+    callers that only need the preview). The input format comes from the
+    path suffix unless given; file objects default to CSV. Blocks are scored
+    with datetime64 dates, which columnar output writes as date32 directly
+    and CSV formats as YYYY-MM-DD.
+    on_progress(fraction) is called after every block with the share of the
+    input consumed, and on_block(results, report) with each scored block
+    and its validation report.
+    Returns (rows_scored, preview, report): preview holds the first
+    preview_rows results (datetime64 dates) and report the validation
+    report of all rows, or its first report_rows problems when given.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return score_csv_in_chunks(f, output, chunk_rows, ref, on_progress, preview_rows,
+                                       file_format or file_format_of(source), output_format, report_rows, on_block)
+
+    size = _source_size(source)
+    writer = ResultWriter(output, output_format) if output is not None else None
+    rows_scored = 0
+    preview = []
+    reports = []
+    problems_kept = 0
+    blocks = iter_scored_chunks(source, chunk_rows, ref, file_format or 'csv', dates_as_text=False)
+    for block, report in blocks:
+        if writer is not None:
+            with stage('write_output'):
+                writer.write(encode_block(block, output_format, header=rows_scored == 0))
+        if rows_scored < preview_rows:
+            preview.append(block.iloc[:preview_rows - rows_scored])
+        if not report.empty and (report_rows is None or problems_kept < report_rows):
+            reports.append(report if report_rows is None else report.iloc[:report_rows - problems_kept])
+            problems_kept += len(reports[-1])
+        rows_scored += len(block)
+        if on_block is not None:
+            on_block(block, report)
+        if on_progress is not None and size:
+            on_progress(min(source.tell() / size, 1.0))
+    if writer is not None:
+        writer.close()
+    preview_df = pd.concat(preview) if preview else pd.DataFrame()
+    report_df = pd.concat(reports, ignore_index=True) if reports else pd.DataFrame(columns=REPORT_COLUMNS)
+    return rows_scored, preview_df, report_df
@@ -0,0 +1,92 @@
+"""
+Opt-in per-stage timing. Core functions are wrapped with @timed(stage) and
+pages can time their own steps with `with stage(...)`; both only record
+inside a collect_timings() block, so the disabled cost is one ContextVar
+lookup per call. Stage times are inclusive: a stage that calls another
+counts the inner stage's time too.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import wraps
+
+import pandas as pd
+
+# JSON-lines file that pages append their timings to when set
+TIMING_LOG_ENV = 'MATURATION_TIMING_LOG'
+
+_current = ContextVar('maturation_timer', default=None)
+
+
+class StageTimer:
+    """Wall time and call count per stage, in the order stages first ran."""
+
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, name, seconds):
+        calls, total = self.stages.get(name, (0, 0.0))
+        self.stages[name] = (calls + 1, total + seconds)
+
+    def as_frame(self):
+        """One row per stage: Stage, Calls, Total (s), Mean (ms)."""
+        rows = [(name, calls, total, total / calls * 1000) for name, (calls, total) in self.stages.items()]
+        return pd.DataFrame(rows, columns=['Stage', 'Calls', 'Total (s)', 'Mean (ms)'])
+
+    def write_log(self, path, **context):
+        """Append one JSON line with the stages and any context fields (page, rows, ...)."""
+        record = {'time': datetime.now(timezone.utc).isoformat(timespec='seconds'), **context,
+                  'stages': {name: {'calls': calls, 'seconds': total} for name, (calls, total) in self.stages.items()}}
+        with open(path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+@contextmanager
+def collect_timings():
+    """Record every timed stage run in this context; yields the StageTimer."""
+    timer = StageTimer()
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block as `name` when timings are being collected."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - started)
+
+
+def timed(name):
+    """Decorator timing every call of the function as stage `name`."""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            timer = _current.get()
+            if timer is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer.add(name, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+def timing_log_path():
+    """Path of the structured timing log, or None when MATURATION_TIMING_LOG is unset."""
+    return os.environ.get(TIMING_LOG_ENV) or None
@@ -0,0 +1,64 @@
+"""Vectorised validation of group uploads into a single row-level report."""
+
+import numpy as np
+import pandas as pd
+
+from .engine import INPUT_COLUMNS, calculate_ages, validate_and_fix_dates
+from .reference import encode_gender, get_reference_data
+from .timing import timed
+
+DATE_COLUMNS = ['Date of Birth', 'Test Date']
+NUMERIC_COLUMNS = ['Body Mass (kg)', 'Standing Height (cm)', "Mother's Height (cm)", "Father's Height (cm)"]
+
+# Columns of the validation report; Row is 1-based, as shown to users
+REPORT_COLUMNS = ['Row', 'Column', 'Reason']
+
+
+def _issues(df, mask, column, reason):
+    mask = np.asarray(mask, dtype=bool)
+    rows = df.index[mask]
+    if isinstance(reason, str):
+        reason = np.full(len(rows), reason, dtype=object)
+    else:
+        reason = np.asarray(reason, dtype=object)[mask]
+    return pd.DataFrame({'Row': rows + 1, 'Column': column, 'Reason': reason})
+
+
+@timed('validate_upload')
+def validate_upload(df, ref=None):
+    """
+    Fix the dates of an upload with validate_and_fix_dates and check every
+    column in one vectorised pass. Returns (df, report) where report has one
+    row per problem found. Raises ValueError when template columns are missing.
+    """
+    missing_columns = [col for col in INPUT_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing columns: {', '.join(missing_columns)}")
+    if ref is None:
+        ref = get_reference_data()
+
+    raw_dates = df[DATE_COLUMNS].copy()
+    df = validate_and_fix_dates(df)
+
+    issues = []
+    for col in DATE_COLUMNS:
+        issues.append(_issues(df, raw_dates[col].isna(), col, "Missing value"))
+        issues.append(_issues(df, raw_dates[col].notna() & df[col].isna(), col,
+                              "Unrecognised date (expected dd/mm/yyyy)"))
+    for col in NUMERIC_COLUMNS:
+        values = pd.to_numeric(df[col], errors='coerce')
+        issues.append(_issues(df, df[col].isna(), col, "Missing value"))
+        issues.append(_issues(df, df[col].notna() & values.isna(), col, "Not a number"))
+
+    gender_codes = encode_gender(df['Gender'])
+    issues.append(_issues(df, gender_codes < 0, 'Gender', "Gender must be Male or Female"))
+
+    # Valid dates and gender but an age the coefficient table does not cover
+    _, round_age = calculate_ages(df['Date of Birth'], df['Test Date'])
+    no_coefficients = (~np.isnan(round_age) & (gender_codes >= 0)
+                       & np.isnan(ref.coefficients.lookup(gender_codes, round_age)[:, 0]))
+    issues.append(_issues(df, no_coefficients, 'Chronological Age',
+                          "No model coefficients for rounded age " + pd.Series(round_age).astype(str)))
+
+    report = pd.concat(issues, ignore_index=True)
+    return df, report.sort_values('Row', kind='stable', ignore_index=True)[REPORT_COLUMNS]
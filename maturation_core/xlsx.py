@@ -0,0 +1,90 @@
+"""
+Excel results workbooks written with openpyxl's write-only mode: rows go
+straight to per-sheet temporary files, so memory stays flat however large
+the group. Each Maturity Status gets its own sheet, numbers are written as
+numeric cells and dates as Excel dates.
+"""
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+# Sheet order; rows without a status (missing inputs) go to the last sheet
+STATUS_SHEETS = {'Pre-PHV': 'Pre-PHV', 'Circa-PHV': 'Circa-PHV', 'Post PHV': 'Post PHV', '': 'Not classified'}
+
+DATE_COLUMNS = ('Date of Birth', 'Test Date')
+
+# Data rows per sheet below Excel's 1,048,576 row limit; further rows continue on "<sheet> (2)", ...
+SHEET_ROWS = 1_048_575
+
+
+def _cell_values(block):
+    """Rows of block as tuples of float, str, date or None (for NaN, NaT and blank text)."""
+    columns = []
+    for col in block.columns:
+        values = block[col]
+        if col in DATE_COLUMNS or pd.api.types.is_datetime64_any_dtype(values):
+            dates = pd.to_datetime(values, format='%Y-%m-%d', errors='coerce')
+            columns.append(dates.dt.date.astype(object).where(dates.notna(), None).tolist())
+        elif pd.api.types.is_numeric_dtype(values):
+            numbers = values.to_numpy(dtype=float)
+            columns.append(np.where(np.isnan(numbers), None, numbers.astype(object)).tolist())
+        else:
+            columns.append(values.astype(object).where(values.notna() & (values != ''), None).tolist())
+    return zip(*columns)
+
+
+class StatusWorkbookWriter:
+    """
+    Appends results blocks to a write-only workbook, one sheet per Maturity
+    Status in STATUS_SHEETS order, each headed by the block's columns. The
+    "Not classified" sheet is only added when some row has no status.
+    close() saves the workbook to `output` (a path or binary file object).
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.workbook = Workbook(write_only=True)
+        self.columns = None
+        # status -> [sheet, data rows on it, part number]
+        self.sheets = {}
+        # (status position, part, sheet) of every sheet created
+        self.order = []
+
+    def _new_sheet(self, status):
+        part = self.sheets[status][2] + 1 if status in self.sheets else 1
+        title = STATUS_SHEETS[status] if part == 1 else f"{STATUS_SHEETS[status]} ({part})"
+        sheet = self.workbook.create_sheet(title)
+        sheet.freeze_panes = 'A2'
+        sheet.append(self.columns)
+        self.sheets[status] = [sheet, 0, part]
+        self.order.append((list(STATUS_SHEETS).index(status), part, sheet))
+
+    def write(self, block):
+        if self.columns is None:
+            self.columns = list(block.columns)
+            for status in STATUS_SHEETS:
+                if status:
+                    self._new_sheet(status)
+        status = block['Maturity Status'].fillna('').to_numpy()
+        for value in STATUS_SHEETS:
+            mask = status == value
+            if not mask.any():
+                continue
+            if value not in self.sheets:
+                self._new_sheet(value)
+            entry = self.sheets[value]
+            for row in _cell_values(block[mask]):
+                if entry[1] >= SHEET_ROWS:
+                    self._new_sheet(value)
+                    entry = self.sheets[value]
+                entry[0].append(row)
+                entry[1] += 1
+
+    def close(self):
+        if self.columns is None:
+            self.workbook.create_sheet(STATUS_SHEETS['Pre-PHV'])
+        # Continuation sheets follow the first sheet of their status
+        for position, (_, _, sheet) in enumerate(sorted(self.order, key=lambda item: item[:2])):
+            self.workbook.move_sheet(sheet.title, position - self.workbook.index(sheet))
+        self.workbook.save(self.output)
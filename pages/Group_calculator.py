@@ -1,255 +1,93 @@
-import streamlit as st
-import pandas as pd
-from datetime import datetime
-import numpy as np
-
-# -----------------------------
-# Calculation Functions
-# -----------------------------
-def chronological_age(dob, test_date):
-    if pd.isna(dob) or pd.isna(test_date):
-        return np.nan
-    days_diff = (test_date - dob).days
-    return days_diff / 365.25
-
-def rounded_age(age):
-    if pd.isna(age):
-        return np.nan
-    return round(age / 0.5) * 0.5
-
-def kg_to_lbs(kg):
-    if pd.isna(kg):
-        return np.nan
-    return kg * 2.205
-
-def cm_to_inches(cm):
-    if pd.isna(cm):
-        return np.nan
-    return cm * 0.393701
-
-def get_height_coefficient(gender, rounded_age_val):
-    metric_coef = pd.read_excel('Maturation_calculator.xlsx', sheet_name='Metric coefficients')
-    if gender == "Male":
-        try:
-            match_idx = metric_coef['Age'].eq(rounded_age_val).idxmax()
-            return metric_coef.iloc[match_idx]['Stature (in)']
-        except:
-            return np.nan
-    elif gender == "Female":
-        try:
-            match_idx = metric_coef['Age.1'].eq(rounded_age_val).idxmax()
-            return metric_coef.iloc[match_idx]['Height']
-        except:
-            return np.nan
-    return np.nan
-
-def get_weight_coefficient(gender, rounded_age_val):
-    metric_coef = pd.read_excel('Maturation_calculator.xlsx', sheet_name='Metric coefficients')
-    if gender == "Male":
-        try:
-            match_idx = metric_coef['Age'].eq(rounded_age_val).idxmax()
-            return metric_coef.iloc[match_idx]['Weight (lb)']
-        except:
-            return np.nan
-    elif gender == "Female":
-        try:
-            match_idx = metric_coef['Age.1'].eq(rounded_age_val).idxmax()
-            return metric_coef.iloc[match_idx]['Weight']
-        except:
-            return np.nan
-    return np.nan
-
-def adjust_mother_height_inches(mother_height_inches):
-    if pd.isna(mother_height_inches):
-        return np.nan
-    return 2.803 + (0.953 * mother_height_inches)
-
-def inches_to_cm(inches):
-    if pd.isna(inches):
-        return np.nan
-    return inches * 2.54
-
-def adjust_father_height_inches(father_height_inches):
-    if pd.isna(father_height_inches):
-        return np.nan
-    return 2.316 + (0.955 * father_height_inches)
-
-def calculate_midparent_height_cm(adj_mother_cm, adj_father_cm):
-    if pd.isna(adj_mother_cm) or pd.isna(adj_father_cm):
-        return np.nan
-    return (adj_mother_cm + adj_father_cm) / 2
-
-def get_midparent_coefficient(gender, rounded_age_val):
-    metric_coef = pd.read_excel('Maturation_calculator.xlsx', sheet_name='Metric coefficients')
-    if gender == "Male":
-        try:
-            match_idx = metric_coef['Age'].eq(rounded_age_val).idxmax()
-            return metric_coef.iloc[match_idx]['Midparent Stature (in)']
-        except:
-            return np.nan
-    elif gender == "Female":
-        try:
-            match_idx = metric_coef['Age.1'].eq(rounded_age_val).idxmax()
-            return metric_coef.iloc[match_idx]['Md parent']
-        except:
-            return np.nan
-    return np.nan
-
-def calculate_midparent_inches(gender, midparent_cm):
-    if pd.isna(midparent_cm):
-        return np.nan
-    inches = midparent_cm * 0.393701
-    if gender == "Male":
-        return inches + 2.5
-    elif gender == "Female":
-        return inches - 2.5
-    return np.nan
-
-def get_intersect(gender, rounded_age_val):
-    metric_coef = pd.read_excel('Maturation_calculator.xlsx', sheet_name='Metric coefficients')
-    if gender == "Male":
-        try:
-            match_idx = metric_coef['Age'].eq(rounded_age_val).idxmax()
-            return metric_coef.iloc[match_idx]['Beta']
-        except:
-            return np.nan
-    elif gender == "Female":
-        try:
-            match_idx = metric_coef['Age.1'].eq(rounded_age_val).idxmax()
-            return metric_coef.iloc[match_idx]['Intersect']
-        except:
-            return np.nan
-    return np.nan
-
-def calculate_predicted_adult_height_cm(intersect, height_coef, height_cm, weight_coef, weight_kg, midparent_coef, midparent_height_cm):
-    if any(pd.isna(x) for x in [intersect, height_coef, height_cm, weight_coef, weight_kg, midparent_coef, midparent_height_cm]):
-        return np.nan
-    return intersect + (height_coef * height_cm) + (weight_coef * weight_kg) + (midparent_coef * midparent_height_cm)
-
-def calculate_percent_predicted_height(current_height_cm, predicted_height_cm):
-    if pd.isna(current_height_cm) or pd.isna(predicted_height_cm) or predicted_height_cm == 0:
-        return np.nan
-    return (current_height_cm / predicted_height_cm) * 100
-
-def calculate_biological_age(gender, percent_predicted_height, sa_df):
-    if pd.isna(percent_predicted_height):
-        return np.nan
-    pah_col = '%PAH Males' if gender == "Male" else '%PAH females'
-    abs_diff = abs(sa_df[pah_col] - percent_predicted_height)
-    min_diff_idx = abs_diff.idxmin()
-    return sa_df.loc[min_diff_idx, 'Age']
+import hashlib
+import io
+from contextlib import nullcontext
 
-def calculate_ba_ca(chronological_age_val, biological_age_val):
-    if pd.isna(chronological_age_val) or pd.isna(biological_age_val):
-        return np.nan
-    return biological_age_val - chronological_age_val
-
-def calculate_timing(ba_ca_val):
-    if pd.isna(ba_ca_val):
-        return ""
-    if ba_ca_val > 0.5:
-        return "Early"
-    elif ba_ca_val <= -0.5:
-        return "Late"
-    else:
-        return "On Time"
-
-def calculate_alt_timing(ba_ca_val):
-    if pd.isna(ba_ca_val):
-        return ""
-    if ba_ca_val > 1:
-        return "Early"
-    elif ba_ca_val <= -1:
-        return "Late"
-    else:
-        return "On Time"
-
-def calculate_maturity_status(percent_predicted_height):
-    if pd.isna(percent_predicted_height):
-        return ""
-    if percent_predicted_height <= 88:
-        return "Pre-PHV"
-    elif percent_predicted_height <= 95:
-        return "Circa-PHV"
-    else:
-        return "Post PHV"
-
-def calculate_lower_bound_50(predicted_height_cm, rounded_age_val):
-    if pd.isna(predicted_height_cm) or pd.isna(rounded_age_val):
-        return np.nan
-    try:
-        target_age = rounded_age_val + 0.5
-        closest_age_idx = errors_df['Age'].searchsorted(target_age)
-        if closest_age_idx >= len(errors_df):
-            return predicted_height_cm
-        error_value = errors_df.iloc[closest_age_idx][0.5]
-        return predicted_height_cm - error_value
-    except:
-        return predicted_height_cm
-
-def calculate_upper_bound_50(predicted_height_cm, rounded_age_val):
-    if pd.isna(predicted_height_cm) or pd.isna(rounded_age_val):
-        return np.nan
-    try:
-        target_age = rounded_age_val + 0.5
-        closest_age_idx = errors_df['Age'].searchsorted(target_age)
-        if closest_age_idx >= len(errors_df):
-            return predicted_height_cm
-        error_value = errors_df.iloc[closest_age_idx][0.5]
-        return predicted_height_cm + error_value
-    except:
-        return predicted_height_cm
-
-def calculate_lower_bound_90(predicted_height_cm, rounded_age_val):
-    if pd.isna(predicted_height_cm) or pd.isna(rounded_age_val):
-        return np.nan
-    try:
-        target_age = rounded_age_val + 0.5
-        closest_age_idx = errors_df['Age'].searchsorted(target_age)
-        if closest_age_idx >= len(errors_df):
-            return predicted_height_cm
-        error_value = errors_df.iloc[closest_age_idx][0.9]
-        return predicted_height_cm - error_value
-    except:
-        return predicted_height_cm
-
-def calculate_upper_bound_90(predicted_height_cm, rounded_age_val):
-    if pd.isna(predicted_height_cm) or pd.isna(rounded_age_val):
-        return np.nan
-    try:
-        target_age = rounded_age_val + 0.5
-        closest_age_idx = errors_df['Age'].searchsorted(target_age)
-        if closest_age_idx >= len(errors_df):
-            return predicted_height_cm
-        error_value = errors_df.iloc[closest_age_idx][0.9]
-        return predicted_height_cm + error_value
-    except:
-        return predicted_height_cm
-
-def validate_and_fix_dates(df):
-    def validate_dates(row):
-        dob = pd.to_datetime(row['Date of Birth'], errors='coerce')
-        test_date = pd.to_datetime(row['Test Date'], errors='coerce')
-        if pd.isna(dob) or pd.isna(test_date):
-            return pd.Series({'Date of Birth': dob, 'Test Date': test_date})
-        if test_date < dob:
-            return pd.Series({'Date of Birth': test_date, 'Test Date': dob})
-        return pd.Series({'Date of Birth': dob, 'Test Date': test_date})
-    
-    df[['Date of Birth', 'Test Date']] = df.apply(validate_dates, axis=1)
-    return df
+import pandas as pd
+import streamlit as st
 
-# -----------------------------
-# Load Reference Data (cached)
-# -----------------------------
-@st.cache_data
-def load_reference_data():
-    errors = pd.read_excel('Maturation_calculator.xlsx', sheet_name='Errors')
-    sa = pd.read_excel('Maturation_calculator.xlsx', sheet_name='SA')
-    metrics = pd.read_excel('Maturation_calculator.xlsx', sheet_name='Metric coefficients')
-    return errors, sa, metrics
+from maturation_core import export_results, export_upload, get_reference_data, score_csv_in_chunks
+from maturation_core.growth import calculate_growth
+from maturation_core.history import HistoryStore
+from maturation_core.streaming import OUTPUT_SUFFIXES, file_format_of, read_chunks
+from maturation_core.timing import collect_timings, stage, timing_log_path
+from results_view import compact_results, concat_compact, show_results
+
+# Scored uploads kept across sessions, each for up to CACHE_TTL; the least recently used is
+# evicted first. An entry holds the compact view of every result (about 90 MB per million
+# rows), the first EXPORT_ROWS results at full precision, the first REPORT_ROWS validation
+# problems and the problem counts per column.
+CACHED_UPLOADS = 8
+CACHE_TTL = "1h"
+REPORT_ROWS = 10_000
+
+# Uploads up to this many rows are downloaded from the cached results; larger ones are scored again
+EXPORT_ROWS = 100_000
+
+# Results download formats: (format, MIME type)
+RESULT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC": ("arrow", "application/vnd.apache.arrow.file"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def count_problems(report_df):
+    """Problems per column of a validation report (Column, Problems) and the number of rows with any."""
+    counts = report_df['Column'].value_counts(sort=False).rename_axis('Column').reset_index(name='Problems')
+    return counts, report_df['Row'].nunique()
+
+
+@st.cache_data(max_entries=CACHED_UPLOADS, ttl=CACHE_TTL, show_spinner=False)
+def score_upload(upload_hash, reference_version, file_format, _data):
+    """
+    Score an uploaded CSV, Parquet or Arrow file once per (content hash,
+    reference version, input format). The results file is written only
+    when it is downloaded.
+    Returns (compact view of every result, the first EXPORT_ROWS results,
+    the first REPORT_ROWS validation problems, problems per column, rows
+    with problems).
+    """
+    views = []
+    counts = []
+    problem_rows = 0
+
+    def keep_block(block, report):
+        nonlocal problem_rows
+        views.append(compact_results(block))
+        block_counts, block_rows = count_problems(report)
+        counts.append(block_counts)
+        problem_rows += block_rows
+
+    progress_bar = st.progress(0.0, text="Scoring athletes...")
+    _, preview_df, report_df = score_csv_in_chunks(
+        io.BytesIO(_data), None, on_progress=progress_bar.progress, preview_rows=EXPORT_ROWS,
+        file_format=file_format, report_rows=REPORT_ROWS, on_block=keep_block
+    )
+    progress_bar.empty()
+    problem_counts = pd.concat([count_problems(report_df.iloc[:0])[0], *counts])
+    problem_counts = (problem_counts.groupby('Column', sort=False, as_index=False)['Problems'].sum()
+                      .sort_values('Problems', ascending=False, ignore_index=True))
+    return concat_compact(views), preview_df, report_df, problem_counts, problem_rows
+
+
+def show_validation_report(report_df, problem_counts, problem_rows):
+    """One collapsible report for every row-level problem: counts per column, then the problems with a CSV download."""
+    if not problem_rows:
+        return
+    with st.expander(f"Validation report: {problem_rows:,} rows with problems"):
+        st.dataframe(problem_counts, hide_index=True)
+        problems = problem_counts['Problems'].sum()
+        if len(report_df) < problems:
+            st.caption(f"The first {len(report_df):,} of {problems:,} problems are listed below.")
+        st.dataframe(report_df, hide_index=True)
+        st.download_button(
+            label="Download Validation Report",
+            data=report_df.to_csv(index=False),
+            file_name="validation_report.csv",
+            mime="text/csv"
+        )
 
-errors_df, sa_df, metrics_df = load_reference_data()
 
 # -----------------------------
 # Main App Layout
@@ -259,7 +97,8 @@ st.title("Group Maturation Calculator")
 st.sidebar.markdown("## Group Upload Template")
 st.sidebar.markdown("""
 Download this template to use for your group upload.  
-Please upload as a CSV file, and dates should be in **dd/mm/yyyy** format.
+Please upload as a CSV file, and dates should be in **dd/mm/yyyy** format (yyyy-mm-dd is also accepted).
+Parquet and Arrow files with the same columns are read with their own column types.
 """)
 
 # Provide a button to download the template
@@ -276,88 +115,81 @@ except FileNotFoundError:
     st.sidebar.error("Template file not found. Please check the directory.")
 
 # File uploader for group data
-uploaded_file = st.sidebar.file_uploader("Upload Your Group CSV", type=["csv"])
-if uploaded_file is not None:
-    # Force "Name" to be read as string
-    df = pd.read_csv(uploaded_file, dtype={'Name': str})
-
-    df = validate_and_fix_dates(df)
-    
-    results = []
-    for idx, row in df.iterrows():
+uploaded_file = st.sidebar.file_uploader("Upload Your Group File", type=["csv", "parquet", "arrow", "feather"])
+result_format = st.sidebar.selectbox(
+    "Results file format", list(RESULT_FORMATS),
+    help="Excel workbooks have one sheet per Maturity Status."
+)
+output_format, output_mime = RESULT_FORMATS[result_format]
+compress = st.sidebar.checkbox(
+    "Compress CSV download (gzip)", disabled=output_format != "csv",
+    help="Smaller .csv.gz download for large groups; spreadsheet apps need it unzipped first."
+)
+compress = compress and output_format == "csv"
+track_history = st.sidebar.checkbox(
+    "Track athletes across uploads",
+    help="Keep every assessment by Name and Date of Birth; unchanged rows from earlier uploads are not rescored."
+)
+show_timings = st.sidebar.checkbox("Show stage timings", help="Time each processing step of this upload.")
+
+with collect_timings() if show_timings else nullcontext() as timer:
+    if uploaded_file is not None and track_history:
+        # Score only new or changed assessments and show each athlete's full history with growth since the last test
         try:
-            # Extract input values
-            name = row['Name']
-            gender = row['Gender']
-            dob = pd.to_datetime(row['Date of Birth'])
-            test_date = pd.to_datetime(row['Test Date'])
-            body_mass_kg = pd.to_numeric(row['Body Mass (kg)'], errors='coerce')
-            standing_height_cm = pd.to_numeric(row['Standing Height (cm)'], errors='coerce')
-            mothers_height_cm = pd.to_numeric(row["Mother's Height (cm)"], errors='coerce')
-            fathers_height_cm = pd.to_numeric(row["Father's Height (cm)"], errors='coerce')
-            
-            # Compute the various calculations
-            chrono_age = chronological_age(dob, test_date)
-            round_age = rounded_age(chrono_age)
-            height_coef = get_height_coefficient(gender, round_age)
-            weight_coef = get_weight_coefficient(gender, round_age)
-            mother_inches = cm_to_inches(mothers_height_cm)
-            father_inches = cm_to_inches(fathers_height_cm)
-            adj_mother_cm = inches_to_cm(adjust_mother_height_inches(mother_inches))
-            adj_father_cm = inches_to_cm(adjust_father_height_inches(father_inches))
-            midparent_height = calculate_midparent_height_cm(adj_mother_cm, adj_father_cm)
-            midparent_coef = get_midparent_coefficient(gender, round_age)
-            intersect_val = get_intersect(gender, round_age)
-            predicted_height = calculate_predicted_adult_height_cm(
-                intersect_val, height_coef, standing_height_cm, weight_coef, body_mass_kg,
-                midparent_coef, midparent_height
+            upload_df = pd.concat(read_chunks(uploaded_file, file_format=file_format_of(uploaded_file.name)),
+                                  ignore_index=True)
+            results_df, report_df, computed = HistoryStore().score(upload_df)
+        except (ValueError, ImportError) as e:
+            st.error(f"Could not process the upload: {e}")
+            st.stop()
+        results_df = calculate_growth(results_df)
+        st.caption(f"Scored {computed:,} new or changed assessments; {results_df['Name'].nunique():,} athletes "
+                   f"with {len(results_df):,} assessments in total.")
+        show_validation_report(report_df, *count_problems(report_df))
+        with stage("results view"):
+            show_results(results_df, key="history")
+        st.sidebar.download_button(
+            label="Download Results as CSV",
+            data=lambda: export_results(results_df, compress=compress),
+            file_name="maturation_history.csv.gz" if compress else "maturation_history.csv",
+            mime="application/gzip" if compress else "text/csv"
+        )
+    elif uploaded_file is not None:
+        # Score the upload block by block, or reuse the result for identical bytes and reference data
+        data = uploaded_file.getvalue()
+        try:
+            file_format = file_format_of(uploaded_file.name)
+            view_df, preview_df, report_df, problem_counts, problem_rows = score_upload(
+                hashlib.sha256(data).hexdigest(), get_reference_data().version, file_format, data
             )
-            pct_predicted = calculate_percent_predicted_height(standing_height_cm, predicted_height)
-            bio_age = calculate_biological_age(gender, pct_predicted, sa_df)
-            ba_ca_val = calculate_ba_ca(chrono_age, bio_age)
-            timing = calculate_timing(ba_ca_val)
-            alt_timing = calculate_alt_timing(ba_ca_val)
-            maturity_status = calculate_maturity_status(pct_predicted)
-            lower_50 = calculate_lower_bound_50(predicted_height, round_age)
-            upper_50 = calculate_upper_bound_50(predicted_height, round_age)
-            lower_90 = calculate_lower_bound_90(predicted_height, round_age)
-            upper_90 = calculate_upper_bound_90(predicted_height, round_age)
-            
-            # Store the results in a dictionary
-            results.append({
-                'Name': name,
-                'Gender': gender,
-                'Date of Birth': dob.strftime('%Y-%m-%d'),
-                'Test Date': test_date.strftime('%Y-%m-%d'),
-                'Body Mass (kg)': body_mass_kg,
-                'Standing Height (cm)': standing_height_cm,
-                "Mother's Height (cm)": mothers_height_cm,
-                "Father's Height (cm)": fathers_height_cm,
-                'Chronological Age': chrono_age,
-                'Biological Age': bio_age,
-                'BA-CA': ba_ca_val,
-                'Predicted Adult Height (cm)': predicted_height,
-                'Percent of Adult Height': pct_predicted,
-                'Maturity Status': maturity_status,
-                'Timing': timing,
-                'Alt. Timing': alt_timing,
-                '50% Lower Bound': lower_50,
-                '50% Upper Bound': upper_50,
-                '90% Lower Bound': lower_90,
-                '90% Upper Bound': upper_90
-            })
-        except Exception as e:
-            st.error(f"Error processing row {idx+1} ({row.get('Name', 'Unknown')}): {e}")
-    
-    # Convert results list into a DataFrame and display it
-    results_df = pd.DataFrame(results)
-    st.dataframe(results_df)
-    
-    # Create CSV data and add a download button
-    csv_data = results_df.to_csv(index=False).encode('utf-8')
-    st.sidebar.download_button(
-        label="Download Results as CSV",
-        data=csv_data,
-        file_name="maturation_results.csv",
-        mime="text/csv"
-    )
+        except (ValueError, ImportError) as e:
+            st.error(f"Could not process the upload: {e}")
+            st.stop()
+
+        show_validation_report(report_df, problem_counts, problem_rows)
+
+        with stage("results view"):
+            show_results(view_df)
+
+        # Results file written block by block when the download is clicked; uploads with more
+        # results than the cache keeps at full precision are scored again straight into the file
+        def results_file():
+            if len(view_df) == len(preview_df):
+                return export_results(preview_df, output_format, compress)
+            return export_upload(io.BytesIO(data), file_format, output_format, compress)
+
+        file_name = f"maturation_results{OUTPUT_SUFFIXES[output_format]}"
+        st.sidebar.download_button(
+            label=f"Download Results as {result_format}",
+            data=results_file,
+            file_name=f"{file_name}.gz" if compress else file_name,
+            mime="application/gzip" if compress else output_mime
+        )
+
+# Timing breakdown of this run, also appended to the MATURATION_TIMING_LOG file when set
+if timer is not None and timer.stages:
+    with st.sidebar.expander("Stage timings", expanded=True):
+        st.dataframe(timer.as_frame(), hide_index=True)
+    log_path = timing_log_path()
+    if log_path:
+        timer.write_log(log_path, page="Group calculator", file=uploaded_file.name, history=track_history)
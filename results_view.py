@@ -0,0 +1,104 @@
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Rows sent to the browser per page of results
+PAGE_SIZE = 500
+
+FILTER_COLUMNS = ['Maturity Status', 'Timing', 'Gender']
+
+# Text columns held as categories by compact_results
+CATEGORY_COLUMNS = ['Gender', 'Maturity Status', 'Timing', 'Alt. Timing']
+
+# Decimals shown for float32 columns, within the precision float32 holds for these values
+COMPACT_DECIMALS = 4
+
+
+def compact_results(block):
+    """
+    A scored block in the form kept server-side for every row of a large
+    upload, about 90 bytes a row: text columns as categories, numbers as
+    float32, Name as text and dates as datetime64.
+    """
+    columns = {}
+    for col in block.columns:
+        values = block[col]
+        if col in CATEGORY_COLUMNS:
+            columns[col] = values.astype('str').astype('category')
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            columns[col] = values
+        elif pd.api.types.is_numeric_dtype(values):
+            columns[col] = values.astype('float32')
+        else:
+            columns[col] = values.astype('str')
+    return pd.DataFrame(columns, index=block.index)
+
+
+def concat_compact(blocks):
+    """One frame of compact_results blocks, each categorical column holding the union of their categories."""
+    if not blocks:
+        return pd.DataFrame()
+    for col in CATEGORY_COLUMNS:
+        categories = sorted(set().union(*(block[col].cat.categories for block in blocks)))
+        blocks = [block.assign(**{col: block[col].cat.set_categories(categories)}) for block in blocks]
+    return pd.concat(blocks)
+
+
+def select_rows(df, filters=None, sort_by=None, descending=False):
+    """
+    Index labels of the rows matching every {column: allowed values} filter,
+    ordered by sort_by (upload order when None). Only the index is sorted, so
+    the full frame is never copied.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for col, allowed in (filters or {}).items():
+        if allowed:
+            mask &= df[col].isin(allowed).to_numpy()
+    if sort_by is None:
+        return df.index[mask]
+    return df.loc[mask, sort_by].sort_values(ascending=not descending, kind='stable', na_position='last').index
+
+
+def _for_display(rows):
+    """
+    A page of rows as sent to the browser: datetime64 dates as YYYY-MM-DD
+    text and float32 columns widened and rounded to COMPACT_DECIMALS.
+    """
+    columns = {}
+    for col in rows.columns:
+        if pd.api.types.is_datetime64_any_dtype(rows[col]):
+            columns[col] = rows[col].dt.strftime('%Y-%m-%d')
+        elif rows[col].dtype == np.float32:
+            columns[col] = rows[col].astype(float).round(COMPACT_DECIMALS)
+    return rows.assign(**columns)
+
+
+def show_results(df, key="results", page_size=PAGE_SIZE):
+    """Filter, sort and page through df on the server, sending one page to st.dataframe."""
+    filter_cols = st.columns(len(FILTER_COLUMNS))
+    filters = {}
+    for col, container in zip(FILTER_COLUMNS, filter_cols):
+        options = sorted(v for v in df[col].dropna().unique() if v != "")
+        filters[col] = container.multiselect(col, options, key=f"{key}_{col}")
+
+    sort_col, order_col, page_col = st.columns([2, 1, 1])
+    sort_by = sort_col.selectbox("Sort by", ["Upload order"] + list(df.columns), key=f"{key}_sort")
+    descending = order_col.toggle("Descending", key=f"{key}_descending")
+    rows = select_rows(df, filters, None if sort_by == "Upload order" else sort_by, descending)
+
+    pages = max(1, math.ceil(len(rows) / page_size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    page = page_col.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, key=page_key)
+
+    start = (page - 1) * page_size
+    page_rows = rows[start:start + page_size]
+    st.dataframe(_for_display(df.loc[page_rows]), hide_index=True)
+    if len(rows):
+        st.caption(f"Rows {start + 1:,}–{start + len(page_rows):,} of {len(rows):,} matching "
+                   f"({len(df):,} athletes in total).")
+    else:
+        st.caption(f"No athletes match these filters ({len(df):,} in total).")
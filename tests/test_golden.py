@@ -0,0 +1,9 @@
+from maturation_core.golden import check_engine, score_batch, score_rowwise
+
+
+def test_batch_engine_matches_golden_outputs():
+    assert check_engine(score_batch).empty
+
+
+def test_rowwise_engine_matches_golden_outputs():
+    assert check_engine(score_rowwise).empty
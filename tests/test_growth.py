@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from maturation_core.benchmark import synthetic_athletes
+from maturation_core.engine import calculate_maturation_batch, validate_and_fix_dates
+from maturation_core.growth import calculate_growth
+from maturation_core.history import HistoryStore
+from maturation_core.reference import get_reference_data
+
+
+def test_missing_name_is_untracked(tmp_path):
+    first = synthetic_athletes(10)
+    later = first.copy()
+    later['Test Date'] = (pd.to_datetime(first['Test Date'], format='%d/%m/%Y')
+                          + pd.Timedelta(days=365)).dt.strftime('%d/%m/%Y')
+    later['Standing Height (cm)'] += 6
+    upload = pd.concat([first, later], ignore_index=True)
+    upload.loc[[0, 10], 'Name'] = None
+
+    history, _, _ = HistoryStore(str(tmp_path / 'history.sqlite')).score(upload)
+    growth = calculate_growth(history)
+
+    velocity = growth['Height Velocity (cm/yr)']
+    assert velocity[growth['Name'].isna()].isna().all()
+    tracked = velocity[growth['Name'].notna()].dropna()
+    assert len(tracked) == 9
+    assert np.allclose(tracked, 6 * 365.25 / 365)
+
+
+def test_peak_velocity_ages():
+    index = get_reference_data().biological_age_index
+    assert index.peak_velocity_age("Male") == pytest.approx(13.5835)
+    assert index.peak_velocity_age("Female") == pytest.approx(10.875)
+
+
+def test_years_and_age_at_phv():
+    athletes = pd.DataFrame({
+        'Name': ['A', 'B'],
+        'Gender': ['Male', 'Female'],
+        'Date of Birth': ['01/01/2010', '01/01/2012'],
+        'Test Date': ['01/01/2024', '01/01/2024'],
+        'Body Mass (kg)': [55.0, 38.0],
+        'Standing Height (cm)': [165.0, 150.0],
+        "Mother's Height (cm)": [165.0, 165.0],
+        "Father's Height (cm)": [180.0, 180.0],
+    })
+    growth = calculate_growth(calculate_maturation_batch(validate_and_fix_dates(athletes)))
+
+    assert growth['Biological Age'].tolist() == pytest.approx([14.167, 11.667])
+    assert growth['Years from PHV'].tolist() == pytest.approx([14.167 - 13.5835, 11.667 - 10.875])
+    assert growth['Age at PHV'].tolist() == pytest.approx([5113 / 365.25 - 0.5835, 12 - 0.792])
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from maturation_core.benchmark import synthetic_athletes
+from maturation_core.history import HistoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / 'history.sqlite'))
+
+
+def one_year_later(upload):
+    later = upload.copy()
+    later['Test Date'] = (pd.to_datetime(upload['Test Date'], format='%d/%m/%Y')
+                          + pd.Timedelta(days=365)).dt.strftime('%d/%m/%Y')
+    later['Standing Height (cm)'] += 6
+    return later
+
+
+def test_identical_upload_is_not_rescored(store):
+    upload = synthetic_athletes(20)
+    first, _, computed = store.score(upload)
+    assert computed == 20
+
+    again, _, computed = store.score(upload)
+    assert computed == 0
+    pd.testing.assert_frame_equal(again, first)
+
+
+def test_changed_row_is_rescored_in_place(store):
+    upload = synthetic_athletes(20)
+    first, _, _ = store.score(upload)
+
+    # Reversed so row positions and index labels differ from the first upload
+    changed = upload.iloc[::-1].copy()
+    changed.loc[7, 'Standing Height (cm)'] += 3
+    history, _, computed = store.score(changed)
+    assert computed == 1
+    assert len(history) == 20
+    is_changed = (history['Name'] == changed.loc[7, 'Name']).to_numpy()
+    assert history.loc[is_changed, 'Standing Height (cm)'].iloc[0] == changed.loc[7, 'Standing Height (cm)']
+    assert (history.loc[is_changed, 'Predicted Adult Height (cm)']
+            != first.loc[is_changed, 'Predicted Adult Height (cm)']).all()
+    pd.testing.assert_frame_equal(history[~is_changed], first[~is_changed])
+
+
+def test_new_test_date_scores_only_new_rows(store):
+    upload = synthetic_athletes(20)
+    store.score(upload)
+
+    history, _, computed = store.score(pd.concat([upload, one_year_later(upload)], ignore_index=True))
+    assert computed == 20
+    assert len(history) == 40
+    assert (history.groupby('Name').size() == 2).all()
+
+
+def test_duplicate_assessment_keeps_last_row(store):
+    upload = synthetic_athletes(5)
+    duplicate = upload.iloc[[2]].assign(**{'Body Mass (kg)': upload.loc[2, 'Body Mass (kg)'] + 4})
+    history, _, computed = store.score(pd.concat([upload, duplicate], ignore_index=True))
+    assert computed == 5
+    assert len(history) == 5
+    row = history[history['Name'] == upload.loc[2, 'Name']].iloc[0]
+    assert row['Body Mass (kg)'] == duplicate['Body Mass (kg)'].iloc[0]
+
+
+def test_rows_without_name_are_scored_but_not_stored(store):
+    upload = synthetic_athletes(5)
+    upload.loc[0, 'Name'] = None
+    history, _, computed = store.score(upload)
+    assert computed == 5
+    assert len(history) == 5
+
+    history, _, computed = store.score(upload)
+    assert computed == 1
+    assert history['Name'].isna().sum() == 1